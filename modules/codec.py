@@ -0,0 +1,68 @@
+# modules/codec.py
+"""
+저장 파일 포맷.
+- 헤더 {"_format": "ytm", "_schema": N, "encoding": ...} + data
+- encoding: json(공백 없는 compact) | zlib+base64 (설정 payload_compression = "zlib")
+- 헤더가 없는 예전 pretty-print(indent=2) 파일도 그대로 읽음
+"""
+from __future__ import annotations
+import json, zlib, base64, threading
+
+FORMAT = "ytm"
+SCHEMA_VERSION = 2  # 1 = 헤더 없는 예전 pretty JSON
+
+_stats_lock = threading.Lock()
+_stats = {"files": 0, "bytes": 0, "pretty_bytes": 0}
+
+def _compact(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+def _compression() -> str:
+    from .github_store import _get  # github_store가 codec을 import하므로 지연 import
+    return "zlib+base64" if str(_get("payload_compression", "none")).lower() in ("zlib", "zlib+base64") else "json"
+
+def encode(obj, encoding: str | None = None) -> str:
+    """obj → 헤더 포함 문자열"""
+    encoding = encoding or _compression()
+    if encoding == "zlib+base64":
+        raw = zlib.compress(_compact(obj).encode("utf-8"), 9)
+        data = base64.b64encode(raw).decode("ascii")
+    else:
+        data = obj
+    return _compact({"_format": FORMAT, "_schema": SCHEMA_VERSION, "encoding": encoding, "data": data})
+
+def decode(obj):
+    """json.loads 결과 → 실제 데이터. 헤더가 없으면 예전 포맷으로 보고 그대로 반환"""
+    if not (isinstance(obj, dict) and obj.get("_format") == FORMAT):
+        return obj
+    if int(obj.get("_schema", 0)) > SCHEMA_VERSION:
+        raise ValueError(f"지원하지 않는 스키마 버전: {obj.get('_schema')}")
+    encoding = obj.get("encoding", "json")
+    if encoding == "zlib+base64":
+        return json.loads(zlib.decompress(base64.b64decode(obj["data"])).decode("utf-8"))
+    if encoding != "json":
+        raise ValueError(f"알 수 없는 인코딩: {encoding}")
+    return obj.get("data")
+
+def loads(text: str):
+    return decode(json.loads(text)) if text else None
+
+# ===== 쓰기 크기 통계 (예전 indent=2 대비 절감량) =====
+
+def note_written(obj, text: str):
+    """실제로 내보낸 파일 하나를 통계에 더함"""
+    pretty = len(json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8"))
+    with _stats_lock:
+        _stats["files"] += 1
+        _stats["bytes"] += len(text.encode("utf-8"))
+        _stats["pretty_bytes"] += pretty
+
+def reset_stats():
+    with _stats_lock:
+        _stats.update(files=0, bytes=0, pretty_bytes=0)
+
+def stats() -> dict:
+    with _stats_lock:
+        out = dict(_stats)
+    out["saved"] = out["pretty_bytes"] - out["bytes"]
+    return out
@@ -3,6 +3,7 @@ from __future__ import annotations
 import streamlit as st
 import pandas as pd
 from typing import Dict, Any, List
+from . import indexes, repository, preview
 
 # UI 유틸: 달력 토글(기본 OFF), 오늘 기준 가장 가까운 날짜, 날짜 문자열 변환, 소품 상태 마커
 from .ui import date_picker_with_toggle, nearest_anchor_date_today, to_datestr, DOT
@@ -25,41 +26,13 @@ def _props_summary_for_content(cid: str | None) -> str:
     """콘텐츠 ID로 소품 요약 (🔴이름(개수), …)"""
     if not cid:
         return "소품 0개"
-    items = st.session_state.get("content_props", {}).get(cid, []) or []
+    items = repository.props(st.session_state, cid)
     if not items:
         return "소품 0개"
-    parts = [
-        f"{DOT.get(p.get('status','예정'),'🔴')}{p.get('name','')}({p.get('quantity',1)}개)"
-        for p in items
-    ]
+    parts = [f"{DOT.get(p.status,'🔴')}{p.name}({p.quantity}개)" for p in items]
     return f"소품 {len(items)}개 · " + ", ".join(parts)
 
 
-def _preview(text: str, max_lines: int = None) -> str:
-    """전체 텍스트를 줄바꿈 유지하여 반환 (max_lines가 None이면 모든 줄)"""
-    if not text:
-        return ""
-    lines = [ln.strip() for ln in str(text).splitlines()]
-    lines = [ln for ln in lines if ln]
-    if max_lines is not None:
-        lines = lines[:max_lines]
-    return "\n".join(lines)
-
-
-def _final_or_draft_preview(content: Dict[str, Any]) -> str:
-    """
-    최종안이 있으면 최종안 전체, 없으면 (초안) + 초안 전체 내용 반환.
-    """
-    final_txt = content.get("final", "") or ""
-    if final_txt.strip():
-        return _preview(final_txt)  # 전체 최종안 내용
-
-    draft_txt = content.get("draft", "") or ""
-    if draft_txt.strip():
-        return "(초안) " + _preview(draft_txt)  # 전체 초안 내용
-    return ""
-
-
 def render():
     """
     개선된 대시보드 렌더링
@@ -84,9 +57,8 @@ def render():
     dkey = to_datestr(sel)
 
     # 상태 읽기
-    daily: List[Dict[str, Any]] = st.session_state.get("daily_contents", {}).get(dkey, []) or []
-    scheds: List[Dict[str, Any]] = st.session_state.get("schedules", {}).get(dkey, []) or []
-    by_id: Dict[str, Dict[str, Any]] = {c.get("id", ""): c for c in daily}
+    daily = repository.contents(st.session_state, dkey)
+    scheds = repository.schedules(st.session_state, dkey)
 
     if not daily and not scheds:
         st.info("📌 이 날짜에는 등록된 콘텐츠가 없습니다.")
@@ -96,9 +68,9 @@ def render():
     st.markdown(f"### 📊 {sel.strftime('%Y년 %m월 %d일')} 콘텐츠 요약")
     
     # 통계 정보
-    total_content = len(daily)
-    completed_count = sum(1 for c in daily 
-                         if st.session_state.get("upload_status", {}).get(c.get("id")) == "업로드완료")
+    day_stats = indexes.pipeline_stats(st.session_state, dkey)
+    total_content = day_stats["total"]
+    completed_count = day_stats["completed"]
     
     # 통계 카드 (간단한 metrics로 대체)
     col1, col2, col3 = st.columns(3)
@@ -113,35 +85,39 @@ def render():
     # 표 데이터 빌드
     rows: List[Dict[str, Any]] = []
     if scheds:
-        # 타임테이블 기준
-        for s in scheds:
-            cid = s.get("cid")
-            title = s.get("title", "")
+        # 타임테이블 기준 (겹치는 일정은 시간 앞에 ⚠️)
+        conflicts = indexes.schedule_conflicts(st.session_state, dkey)
+        if conflicts:
+            st.warning("⚠️ 일정 충돌: " + " / ".join(
+                f"{scheds[i].time_range} {scheds[i].title or '(제목 없음)'} — {', '.join(msgs)}"
+                for i, msgs in sorted(conflicts.items())
+            ))
+        for i, s in enumerate(scheds):
+            cid = s.cid
+            title = s.title
             perf = ""
             final_like = ""
 
-            if cid and cid in by_id:
-                c = by_id[cid]
-                title = c.get("title", title)
-                perf = ", ".join(c.get("performers", []))
-                final_like = _final_or_draft_preview(c)
-            else:
-                for c in daily:
-                    if c.get("title") == title:
-                        cid = c.get("id")
-                        perf = ", ".join(c.get("performers", []))
-                        final_like = _final_or_draft_preview(c)
-                        break
+            # cid 인덱스로 연결, 못 찾으면 그 날짜의 제목 인덱스로
+            c = repository.content(st.session_state, cid)
+            if c is None:
+                by_title = indexes.cid_by_title(st.session_state, dkey, title)
+                if by_title:
+                    cid, c = by_title, repository.content(st.session_state, by_title)
+            if c is not None:
+                title = c.title or title
+                perf = c.performers_text
+                final_like = preview.final_or_draft(c)
 
             # 상태 아이콘 (간단하게)
-            upload_status = st.session_state.get("upload_status", {}).get(cid, "촬영전")
+            upload_status = repository.upload_state(st.session_state, cid).status
             status_icon = SIMPLE_STATUS_ICONS.get(upload_status, "🔵")
             status_badge = f"{status_icon} {upload_status}"
 
             rows.append(
                 {
-                    "시간": f"{s.get('start','')}~{s.get('end','')}",
-                    "유형": s.get("type", ""),
+                    "시간": ("⚠️ " if i in conflicts else "") + s.time_range,
+                    "유형": s.type,
                     "제목": title or "(제목 없음)",
                     "출연": perf,
                     "상태": status_badge,
@@ -152,8 +128,8 @@ def render():
     else:
         # 콘텐츠만 있는 경우
         for c in daily:
-            cid = c.get("id")
-            upload_status = st.session_state.get("upload_status", {}).get(cid, "촬영전")
+            cid = c.id
+            upload_status = repository.upload_state(st.session_state, cid).status
             status_icon = SIMPLE_STATUS_ICONS.get(upload_status, "🔵")
             status_badge = f"{status_icon} {upload_status}"
             
@@ -161,11 +137,11 @@ def render():
                 {
                     "시간": "-",
                     "유형": "-",
-                    "제목": c.get("title", "(제목 없음)"),
-                    "출연": ", ".join(c.get("performers", [])),
+                    "제목": c.title or "(제목 없음)",
+                    "출연": c.performers_text,
                     "상태": status_badge,
                     "소품현황": _props_summary_for_content(cid),
-                    "최종안": _final_or_draft_preview(c),
+                    "최종안": preview.final_or_draft(c),
                 }
             )
 
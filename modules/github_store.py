@@ -1,6 +1,32 @@
 # modules/github_store.py
 from __future__ import annotations
-import os, json, requests
+import os, re, time, random, hashlib, threading, requests
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from . import codec
+
+# 프로세스 공용 조건부 요청 캐시: gist_id → {"etag", "files", "parsed"}
+_gist_cache: dict = {}
+_gist_cache_lock = threading.Lock()
+
+# 월별 샤드 캐시: gist_id → {month: (hash, parsed)} — 해시가 같은 샤드는 다시 받거나 파싱하지 않음
+_shard_cache: dict = {}
+
+DATE_KEYS = ["daily_contents", "schedules"]  # 날짜 키로 나뉘는 데이터
+CID_KEYS = ["content_props", "upload_status"]  # 콘텐츠 id 키 → 콘텐츠 날짜의 샤드로 따라감
+MONTH_RE = re.compile(r"^\d{4}-\d{2}")
+
+# ===== 공용 HTTP 클라이언트 =====
+# 프로세스당 requests.Session 하나로 keep-alive 연결을 재사용 (api.github.com, raw URL 모두)
+HTTP_TIMEOUT = 20
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # 초: 0.5, 1, 2 … 에 지터
+BACKOFF_MAX = 8.0
+RETRY_AFTER_MAX = 30.0  # 이보다 오래 기다리라고 하면 재시도하지 않고 응답 그대로 반환
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_http_session = None
+_http_lock = threading.Lock()
 
 def _get(name: str, default=None):
     try:
@@ -11,56 +37,279 @@ def _get(name: str, default=None):
         pass
     return os.environ.get(name.upper(), default)
 
-def _auth_headers():
-    tok = _get("gh_token") or _get("github_token")
-    if not tok:
+def _auth_headers(token: str | None = None):
+    tok = token if token is not None else (_get("gh_token") or _get("github_token"))
+    if token is None and not tok:
         raise RuntimeError("GitHub 토큰(gh_token/github_token)이 설정되어 있지 않습니다.")
-    return {"Authorization": f"token {tok}", "Accept": "application/vnd.github+json"}
+    headers = {"Accept": "application/vnd.github+json"}
+    if tok:
+        headers["Authorization"] = f"token {tok}"
+    return headers
 
-def gist_load():
-    gist_id = _get("gist_id")
-    if not gist_id:
+def _http() -> requests.Session:
+    global _http_session
+    with _http_lock:
+        if _http_session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _http_session = s
+        return _http_session
+
+def _retry_after(r) -> float | None:
+    """Retry-After(초 또는 HTTP 날짜) → 대기 초"""
+    val = r.headers.get("Retry-After")
+    if not val:
+        return None
+    try:
+        return max(0.0, float(val))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(val).timestamp() - time.time())
+    except Exception:
         return None
 
-    r = requests.get(f"https://api.github.com/gists/{gist_id}", headers=_auth_headers(), timeout=20)
-    r.raise_for_status()
-    data = r.json()
-    files = data.get("files") or {}
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
 
-    # 파일명 우선순위: secrets.gist_filename > youtube_data.json > data_store.json > (그 외 무시)
-    prefer = _get("gist_filename")
-    candidates = []
-    if prefer: candidates.append(prefer)
-    candidates += ["youtube_data.json", "data_store.json"]
+def _request(method: str, url: str, **kw):
+    """
+    공용 세션으로 요청. 연결 오류/5xx/429(및 Retry-After가 붙은 403 rate limit)는
+    지터 백오프로 최대 MAX_RETRIES번 재시도하고, Retry-After가 있으면 그만큼 기다림.
+    """
+    kw.setdefault("timeout", HTTP_TIMEOUT)
+    for attempt in range(MAX_RETRIES + 1):
+        last = attempt == MAX_RETRIES
+        try:
+            r = _http().request(method, url, **kw)
+        except (requests.ConnectionError, requests.Timeout):
+            if last:
+                raise
+            time.sleep(_backoff(attempt))
+            continue
+        retryable = r.status_code in RETRY_STATUS or (r.status_code == 403 and "Retry-After" in r.headers)
+        if not retryable or last:
+            return r
+        wait = _retry_after(r)
+        if wait is not None and wait > RETRY_AFTER_MAX:
+            return r
+        time.sleep(wait if wait is not None else _backoff(attempt))
+    return r
+
+def _dumps(obj) -> str:
+    return codec.encode(obj)
+
+def _hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def _layout() -> str:
+    """gist 저장 방식: monthly(월별 샤드 + 인덱스, 기본) | single(파일 하나)"""
+    return str(_get("gist_layout", "monthly")).lower()
 
-    target = None
+def _file_names(filename: str | None = None):
+    """기본 파일명에서 인덱스/샤드 파일명 규칙 생성: youtube_data.index.json, youtube_data.2025-08.json"""
+    fname = filename or _get("gist_filename", "youtube_data.json")
+    stem = fname[:-5] if fname.lower().endswith(".json") else fname
+    return fname, f"{stem}.index.json", (lambda month: f"{stem}.{month}.json")
+
+def _find_file(files: dict, candidates) -> str | None:
     for name in candidates:
         # 대소문자 안전 비교
         for k in files.keys():
             if k.lower() == name.lower():
-                target = k
-                break
-        if target: break
+                return k
+    return None
+
+def _fetch_gist_files(gist_id: str, token: str | None = None, force: bool = False):
+    """If-None-Match로 gist 메타를 가져옴. 304면 캐시된 항목을 그대로 반환"""
+    with _gist_cache_lock:
+        cached = None if force else _gist_cache.get(gist_id)
+    headers = _auth_headers(token)
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+
+    r = _request("GET", f"https://api.github.com/gists/{gist_id}", headers=headers)
+    if r.status_code == 304 and cached:
+        return cached
+    r.raise_for_status()
+    entry = {"etag": r.headers.get("ETag"), "files": r.json().get("files") or {}, "parsed": {}}
+    with _gist_cache_lock:
+        _gist_cache[gist_id] = entry
+    return entry
 
+def _remember_patch(gist_id: str, r):
+    """
+    PATCH 응답(갱신된 gist 전체)과 ETag를 조건부 요청 캐시로 — 다음 로드는 304.
+    파싱 결과는 비워 두므로 gist_load가 새 객체를 만들고, storage는 내용 지문으로 변경 여부를 봄
+    """
+    try:
+        files = r.json().get("files")
+    except ValueError:
+        files = None
+    with _gist_cache_lock:
+        if files is None:
+            _gist_cache.pop(gist_id, None)
+        else:
+            _gist_cache[gist_id] = {"etag": r.headers.get("ETag"), "files": files, "parsed": {}}
+
+def _read_file(meta: dict) -> str:
+    """파일 본문. 잘린(truncated) 파일만 raw_url로 한 번 더 받음"""
+    if meta.get("truncated") and meta.get("raw_url"):
+        r = _request("GET", meta["raw_url"])
+        r.raise_for_status()
+        return r.text
+    return meta.get("content", "") or ""
+
+# ===== 월별 샤드 =====
+
+def _month_of(key: str) -> str:
+    return key[:7] if MONTH_RE.match(key or "") else "misc"
+
+def _split_monthly(payload: dict):
+    """페이로드를 {month: 부분 페이로드}와 어느 날짜에도 속하지 않는 cid 데이터(orphans)로 분리"""
+    shards: dict = {}
+    cid_month = {}
+    for k in DATE_KEYS:
+        for dkey, items in (payload.get(k) or {}).items():
+            month = _month_of(dkey)
+            shards.setdefault(month, {}).setdefault(k, {})[dkey] = items
+            if k == "daily_contents":
+                for c in items or []:
+                    if isinstance(c, dict) and c.get("id"):
+                        cid_month[c["id"]] = month
+    orphans: dict = {}
+    for k in CID_KEYS:
+        for cid, v in (payload.get(k) or {}).items():
+            month = cid_month.get(cid)
+            target = shards[month] if month else orphans
+            target.setdefault(k, {})[cid] = v
+    return shards, orphans
+
+def _merge_shards(parts, orphans: dict) -> dict:
+    out = {k: {} for k in DATE_KEYS + CID_KEYS}
+    for part in list(parts) + [orphans or {}]:
+        for k in out:
+            out[k].update(part.get(k) or {})
+    return out
+
+def _load_sharded(gist_id: str, files: dict, index_name: str) -> dict:
+    index = codec.loads(_read_file(files[index_name])) or {}
+    cache = _shard_cache.setdefault(gist_id, {})
+    parts = []
+    for month, info in (index.get("shards") or {}).items():
+        hit = cache.get(month)
+        if hit and hit[0] == info.get("hash"):
+            parts.append(hit[1])  # 바뀌지 않은 샤드는 재다운로드/재파싱 생략
+            continue
+        meta = files.get(info.get("file"))
+        if not meta:
+            raise RuntimeError(f"샤드 파일 없음: {info.get('file')}")
+        text = _read_file(meta)
+        part = codec.loads(text) or {}
+        cache[month] = (info.get("hash") or _hash(text), part)
+        parts.append(part)
+    for month in set(cache) - set(index.get("shards") or {}):
+        cache.pop(month, None)
+    data = _merge_shards(parts, index.get("orphans"))
+    data["_last_saved"] = index.get("_last_saved")
+    return data
+
+def _remote_index(gist_id: str, index_name: str, token: str | None = None):
+    """저장 직전의 원격 인덱스와 파일 목록 (If-None-Match라 바뀌지 않았으면 304로 싸게)"""
+    files = _fetch_gist_files(gist_id, token)["files"]
+    index = codec.loads(_read_file(files[index_name])) if index_name in files else None
+    return (index or {}).get("shards") or {}, files
+
+def _save_sharded(gist_id: str, payload: dict, token: str | None = None):
+    """
+    원격 인덱스와 해시가 다른 샤드만 PATCH. 비게 된 샤드는 삭제(null), 인덱스는 매번 갱신.
+    비교 대상은 로컬 캐시가 아니라 PATCH 직전의 원격 인덱스 (다른 인스턴스가 그 사이 쓴 샤드도 덮어씀)
+    """
+    _, index_name, shard_name = _file_names()
+    remote, remote_files = _remote_index(gist_id, index_name, token)
+    cache = _shard_cache.setdefault(gist_id, {})
+
+    shards, orphans = _split_monthly(payload)
+    files, index_shards, written = {}, {}, {}
+    for month, part in sorted(shards.items()):
+        text = _dumps(part)
+        h = _hash(text)
+        name = shard_name(month)
+        index_shards[month] = {"file": name, "hash": h}
+        written[month] = (h, part)
+        if (remote.get(month) or {}).get("hash") != h or name not in remote_files:
+            files[name] = {"content": text}
+            codec.note_written(part, text)
+    for month, info in remote.items():
+        name = info.get("file") or shard_name(month)
+        if month not in shards and name in remote_files:
+            files[name] = None
+
+    index = {
+        "_layout": "monthly",
+        "_last_saved": payload.get("_last_saved"),
+        "shards": index_shards,
+        "orphans": orphans,
+    }
+    files[index_name] = {"content": _dumps(index)}
+    codec.note_written(index, files[index_name]["content"])
+    r = _request("PATCH", f"https://api.github.com/gists/{gist_id}", headers=_auth_headers(token),
+                 json={"files": files})
+    r.raise_for_status()
+    # 원격 샤드 = 방금 인덱스에 적은 내용 (올린 것 + 해시가 같아 건너뛴 것)
+    cache.clear()
+    cache.update(written)
+    return r
+
+# ===== 공개 API =====
+
+def gist_load(gist_id: str | None = None, token: str | None = None,
+              filename: str | None = None, force: bool = False):
+    """
+    gist에서 데이터를 읽어 dict 반환. 인덱스 파일이 있으면 월별 샤드를 합치고, 없으면 단일 파일.
+    변경이 없으면(304) 이전에 만든 객체를 그대로 돌려주므로 호출 측에서 수정하지 말 것.
+    gist_id/token/filename을 주면 secrets 대신 사용(강제 가져오기용), force는 캐시 무시.
+    """
+    gist_id = gist_id or _get("gist_id")
+    if not gist_id:
+        return None
+
+    entry = _fetch_gist_files(gist_id, token, force=force)
+    files = entry["files"]
+    fname, index_name, _ = _file_names(filename)
+
+    index_key = _find_file(files, [index_name])
+    if index_key:
+        if index_key not in entry["parsed"]:
+            entry["parsed"][index_key] = _load_sharded(gist_id, files, index_key)
+        return entry["parsed"][index_key]
+
+    # 파일명 우선순위: secrets.gist_filename > youtube_data.json > data_store.json > (그 외 무시)
+    target = _find_file(files, [fname, "youtube_data.json", "data_store.json"])
     if not target:
         # 일치 파일 못 찾으면 실패 (gistfile1.txt 같은 건 무시)
         return None
 
-    meta = files[target]
-    if meta.get("truncated") and meta.get("raw_url"):
-        raw = requests.get(meta["raw_url"], timeout=20).text
-        return json.loads(raw)
-    content = meta.get("content", "")
-    return json.loads(content) if content else None
+    if target not in entry["parsed"]:
+        entry["parsed"][target] = codec.loads(_read_file(files[target]))
+    return entry["parsed"][target]
 
 def gist_save(payload: dict):
     gist_id = _get("gist_id")
     if not gist_id:
         return False
-    fname = _get("gist_filename", "youtube_data.json")
-    body = {"files": {fname: {"content": json.dumps(payload, ensure_ascii=False, indent=2)}}}
-    r = requests.patch(f"https://api.github.com/gists/{gist_id}", headers=_auth_headers(), json=body, timeout=20)
-    r.raise_for_status()
+    if _layout() == "monthly":
+        r = _save_sharded(gist_id, payload)
+    else:
+        fname = _get("gist_filename", "youtube_data.json")
+        text = _dumps(payload)
+        codec.note_written(payload, text)
+        body = {"files": {fname: {"content": text}}}
+        r = _request("PATCH", f"https://api.github.com/gists/{gist_id}", headers=_auth_headers(), json=body)
+        r.raise_for_status()
+    _remember_patch(gist_id, r)
     return True
 
 # Repo는 안 쓰면 스텁
@@ -0,0 +1,474 @@
+# modules/indexes.py
+"""
+세션 데이터 위의 파생 인덱스. 하이드레이트 때 새로 만들고, 변경(mutate) 때 바뀐 부분만 갱신.
+렌더링 쪽은 읽기만 함.
+- 날짜 인덱스: 내용이 있는 날짜를 정렬된 date 배열로 유지 → 이전/다음/가장 가까운 날짜를 bisect로 O(log n)
+  contents = 콘텐츠가 있는 날짜, any = 콘텐츠 또는 스케줄이 있는 날짜
+- 콘텐츠 id 인덱스: cid → (날짜, 위치), 날짜별 제목 → cid  → 전체 날짜를 훑지 않고 O(1) 조회
+- 진행 현황 집계: 날짜별/전체 업로드 상태 개수 → 사이드바/대시보드 통계를 전체 스캔 없이
+- 일정 구간 인덱스: 날짜별 (시작분, 종료분) 정렬 목록 + 출연자별 전체 날짜 목록 → 겹치는 촬영/출연자 중복을 정렬 후 한 번 훑어 찾음
+- 출연자 인덱스: 출연자 → (날짜, cid) 정렬 목록 → 기간별 출연 콘텐츠/일정을 bisect 구간으로
+streamlit에 의존하지 않음 (journal처럼 세션 상태나 일반 dict 모두 가능)
+"""
+from __future__ import annotations
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional
+
+from .models import to_minutes, minutes_text
+
+DATE_INDEX_KEY = "_date_index"
+CID_INDEX_KEY = "_cid_index"
+PIPELINE_KEY = "_pipeline"
+SCHEDULE_INDEX_KEY = "_schedule_index"
+PERFORMER_INDEX_KEY = "_performer_index"
+DEFAULT_STATUS = "촬영전"
+DONE_STATUSES = ("업로드완료",)
+IN_PROGRESS_STATUSES = ("촬영완료", "편집완료")
+DATE_KINDS = {
+    "contents": ("daily_contents",),
+    "any": ("daily_contents", "schedules"),
+}
+
+
+def _parse(dkey: str) -> Optional[date]:
+    try:
+        return datetime.strptime(dkey, "%Y-%m-%d").date()
+    except Exception:
+        return None
+
+
+# ========== 날짜 인덱스 ==========
+
+def _has_items(state, kind: str, dkey: str) -> bool:
+    return any((state.get(k) or {}).get(dkey) for k in DATE_KINDS[kind])
+
+def rebuild_dates(state) -> Dict[str, Any]:
+    """전체 스캔으로 날짜 인덱스를 새로 만듦 (하이드레이트/전체 교체 때만)"""
+    prev = state.get(DATE_INDEX_KEY)
+    index: Dict[str, Any] = {"version": (prev["version"] + 1) if prev else 1}
+    for kind, keys in DATE_KINDS.items():
+        days = set()
+        for k in keys:
+            for dkey, items in (state.get(k) or {}).items():
+                if items:
+                    d = _parse(dkey)
+                    if d:
+                        days.add(d)
+        index[kind] = sorted(days)
+    state[DATE_INDEX_KEY] = index
+    return index
+
+def _date_index(state) -> Dict[str, Any]:
+    index = state.get(DATE_INDEX_KEY)
+    return index if index is not None else rebuild_dates(state)
+
+def refresh_dates(state, dkeys):
+    """주어진 날짜 키들만 다시 확인해 정렬 배열에 넣거나 뺌"""
+    index = _date_index(state)
+    for dkey in dkeys:
+        d = _parse(dkey or "")
+        if not d:
+            continue
+        for kind in DATE_KINDS:
+            days = index[kind]
+            i = bisect_left(days, d)
+            present = i < len(days) and days[i] == d
+            want = _has_items(state, kind, dkey)
+            if want and not present:
+                days.insert(i, d)
+                index["version"] += 1
+            elif present and not want:
+                days.pop(i)
+                index["version"] += 1
+
+def date_version(state) -> int:
+    """날짜 구성이 바뀔 때마다 올라가는 번호 (달력 이벤트 캐시 키)"""
+    return _date_index(state)["version"]
+
+def dates(state, kind: str = "contents") -> List[date]:
+    """정렬된 날짜 배열. 인덱스 자체를 돌려주므로 호출 측에서 수정하지 말 것"""
+    return _date_index(state)[kind]
+
+def dates_between(state, start: date, end: date, kind: str = "contents") -> List[date]:
+    """start~end(포함) 사이 날짜"""
+    days = dates(state, kind)
+    return days[bisect_left(days, start):bisect_right(days, end)]
+
+def prev_date(state, d: date, kind: str = "contents") -> Optional[date]:
+    """d보다 앞선 마지막 날짜. 없으면 첫 날짜, 인덱스가 비었으면 None"""
+    days = dates(state, kind)
+    if not days:
+        return None
+    i = bisect_left(days, d)
+    return days[i-1] if i > 0 else days[0]
+
+def next_date(state, d: date, kind: str = "contents") -> Optional[date]:
+    """d보다 뒤의 첫 날짜. 없으면 마지막 날짜, 인덱스가 비었으면 None"""
+    days = dates(state, kind)
+    if not days:
+        return None
+    i = bisect_right(days, d)
+    return days[i] if i < len(days) else days[-1]
+
+def nearest_date(state, today: date, kind: str = "contents") -> Optional[date]:
+    """today 이후(당일 포함) 첫 날짜, 없으면 마지막 날짜"""
+    days = dates(state, kind)
+    if not days:
+        return None
+    i = bisect_left(days, today)
+    return days[i] if i < len(days) else days[-1]
+
+
+# ========== 콘텐츠 id 인덱스 ==========
+# {"ids": {cid: (날짜, 위치)}, "days": {날짜: [cid, ...]}, "titles": {날짜: {제목: cid}}}
+
+def _index_day(index, dkey: str, items):
+    ids, titles = [], {}
+    for pos, c in enumerate(items or []):
+        cid = c.get("id") if isinstance(c, dict) else None
+        if not cid:
+            continue
+        index["ids"][cid] = (dkey, pos)
+        ids.append(cid)
+        titles.setdefault(c.get("title", ""), cid)  # 같은 제목이면 앞선 것
+    if ids:
+        index["days"][dkey] = ids
+        index["titles"][dkey] = titles
+
+def rebuild_cids(state):
+    index = {"ids": {}, "days": {}, "titles": {}}
+    for dkey, items in (state.get("daily_contents") or {}).items():
+        _index_day(index, dkey, items)
+    state[CID_INDEX_KEY] = index
+    return index
+
+def _cid_index(state):
+    index = state.get(CID_INDEX_KEY)
+    return index if index is not None else rebuild_cids(state)
+
+def refresh_cids(state, dkeys):
+    """주어진 날짜의 콘텐츠만 다시 색인 (하루치 목록 길이만큼)"""
+    index = _cid_index(state)
+    for dkey in dkeys:
+        if not dkey:
+            continue
+        for cid in index["days"].pop(dkey, []):
+            if index["ids"].get(cid, (None,))[0] == dkey:
+                del index["ids"][cid]
+        index["titles"].pop(dkey, None)
+        _index_day(index, dkey, (state.get("daily_contents") or {}).get(dkey))
+
+def _valid(state, cid: str, hit) -> bool:
+    day = (state.get("daily_contents") or {}).get(hit[0]) or []
+    return hit[1] < len(day) and day[hit[1]].get("id") == cid
+
+def locate(state, cid: str | None):
+    """cid → (날짜, 위치). 가리키는 위치가 실제 데이터와 어긋나 있으면 한 번 다시 만들어 확인"""
+    if not cid:
+        return None
+    hit = _cid_index(state)["ids"].get(cid)
+    if hit is None or _valid(state, cid, hit):
+        return hit
+    hit = rebuild_cids(state)["ids"].get(cid)
+    return hit if hit and _valid(state, cid, hit) else None
+
+def content(state, cid: str | None) -> Optional[Dict[str, Any]]:
+    """cid로 콘텐츠 dict 조회 (없으면 None)"""
+    hit = locate(state, cid)
+    return state["daily_contents"][hit[0]][hit[1]] if hit else None
+
+def cid_by_title(state, dkey: str, title: str) -> Optional[str]:
+    """그 날짜에서 제목이 같은 첫 콘텐츠의 cid (cid 없는 스케줄 항목 연결용)"""
+    return _cid_index(state)["titles"].get(dkey, {}).get(title)
+
+
+# ========== 진행 현황 집계 ==========
+# {"all": {상태: 개수}, "days": {날짜: {상태: 개수}}}
+
+def _count_day(state, items) -> Dict[str, int]:
+    us = state.get("upload_status") or {}
+    counts: Dict[str, int] = {}
+    for c in items or []:
+        status = us.get(c.get("id", ""), DEFAULT_STATUS)
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+def rebuild_pipeline(state):
+    agg = {"all": {}, "days": {}}
+    for dkey, items in (state.get("daily_contents") or {}).items():
+        counts = _count_day(state, items)
+        if counts:
+            agg["days"][dkey] = counts
+            for status, n in counts.items():
+                agg["all"][status] = agg["all"].get(status, 0) + n
+    state[PIPELINE_KEY] = agg
+    return agg
+
+def _pipeline(state):
+    agg = state.get(PIPELINE_KEY)
+    return agg if agg is not None else rebuild_pipeline(state)
+
+def refresh_pipeline(state, dkeys):
+    """주어진 날짜만 다시 세고, 전체 합계에는 그 차이만 반영"""
+    agg = _pipeline(state)
+    for dkey in set(dkeys):
+        if not dkey:
+            continue
+        old = agg["days"].pop(dkey, {})
+        new = _count_day(state, (state.get("daily_contents") or {}).get(dkey))
+        if new:
+            agg["days"][dkey] = new
+        for status in set(old) | set(new):
+            n = agg["all"].get(status, 0) + new.get(status, 0) - old.get(status, 0)
+            if n:
+                agg["all"][status] = n
+            else:
+                agg["all"].pop(status, None)
+
+def pipeline_stats(state, dkey: str | None = None) -> Dict[str, int]:
+    """total/completed/in_progress (dkey가 없으면 전체)"""
+    agg = _pipeline(state)
+    counts = agg["all"] if dkey is None else agg["days"].get(dkey, {})
+    return {
+        "total": sum(counts.values()),
+        "completed": sum(counts.get(s, 0) for s in DONE_STATUSES),
+        "in_progress": sum(counts.get(s, 0) for s in IN_PROGRESS_STATUSES),
+    }
+
+
+# ========== 일정 구간 인덱스 / 충돌 ==========
+# {"days": {날짜: [(시작분, 종료분, 위치)]}, "performers": {이름: [(날짜, 시작분, 종료분, 위치)]},
+#  "day_performers": {날짜: {이름}}, "conflicts": {날짜: {위치: [메시지]}}}
+
+def _performers_of(state, cid) -> List[str]:
+    hit = locate(state, cid)
+    if not hit:
+        return []
+    return _clean_names(state["daily_contents"][hit[0]][hit[1]].get("performers"))
+
+def _overlaps(intervals):
+    """(시작, 종료, 키) 목록에서 겹치는 쌍. 시작 순으로 정렬 후 지금까지의 최대 종료와 비교"""
+    pairs = []
+    max_end, max_key = None, None
+    for start, end, key in sorted(intervals):
+        if max_end is not None and start < max_end:
+            pairs.append((key, max_key))
+        if max_end is None or end > max_end:
+            max_end, max_key = end, key
+    return pairs
+
+def _day_conflicts(index, state, dkey: str) -> Dict[int, List[str]]:
+    day = (state.get("schedules") or {}).get(dkey) or []
+    intervals = index["days"].get(dkey, [])
+    spans = {i: (s, e) for s, e, i in intervals}
+
+    def label(i):
+        return f"{minutes_text(spans[i][0])}~{minutes_text(spans[i][1])} {day[i].get('title') or '(제목없음)'}"
+
+    out: Dict[int, List[str]] = {}
+    for a, b in _overlaps(intervals):
+        out.setdefault(a, []).append(f"시간 겹침: {label(b)}")
+        out.setdefault(b, []).append(f"시간 겹침: {label(a)}")
+    for name in sorted(index["day_performers"].get(dkey, ())):
+        entries = index["performers"][name]
+        lo = bisect_left(entries, (dkey,))
+        hi = bisect_left(entries, (dkey, float("inf")))
+        for a, b in _overlaps([(s, e, i) for _, s, e, i in entries[lo:hi]]):
+            out.setdefault(a, []).append(f"출연자 중복: {name} ({label(b)})")
+            out.setdefault(b, []).append(f"출연자 중복: {name} ({label(a)})")
+    return out
+
+def _index_schedule_day(index, state, dkey: str):
+    intervals = []
+    names = set()
+    for i, s in enumerate((state.get("schedules") or {}).get(dkey) or []):
+        start = to_minutes(s.get("start") or "00:00")
+        end = max(start, to_minutes(s.get("end") or "00:00"))
+        intervals.append((start, end, i))
+        for name in _performers_of(state, s.get("cid")):
+            insort(index["performers"].setdefault(name, []), (dkey, start, end, i))
+            names.add(name)
+    if intervals:
+        index["days"][dkey] = sorted(intervals)
+    if names:
+        index["day_performers"][dkey] = names
+    conflicts = _day_conflicts(index, state, dkey) if intervals else {}
+    if conflicts:
+        index["conflicts"][dkey] = conflicts
+
+def rebuild_schedules(state):
+    index = {"days": {}, "performers": {}, "day_performers": {}, "conflicts": {}}
+    for dkey in (state.get("schedules") or {}):
+        _index_schedule_day(index, state, dkey)
+    state[SCHEDULE_INDEX_KEY] = index
+    return index
+
+def _schedule_index(state):
+    index = state.get(SCHEDULE_INDEX_KEY)
+    return index if index is not None else rebuild_schedules(state)
+
+def refresh_schedules(state, dkeys):
+    """주어진 날짜의 구간만 빼고 다시 넣은 뒤 그 날짜의 충돌을 다시 계산"""
+    index = _schedule_index(state)
+    for dkey in set(dkeys):
+        if not dkey:
+            continue
+        for name in index["day_performers"].pop(dkey, ()):
+            entries = index["performers"].get(name, [])
+            del entries[bisect_left(entries, (dkey,)):bisect_left(entries, (dkey, float("inf")))]
+            if not entries:
+                index["performers"].pop(name, None)
+        index["days"].pop(dkey, None)
+        index["conflicts"].pop(dkey, None)
+        _index_schedule_day(index, state, dkey)
+
+def schedule_conflicts(state, dkey: str) -> Dict[int, List[str]]:
+    """그 날짜 스케줄 위치 → 충돌 메시지 목록 (겹치는 시간, 같은 출연자 중복)"""
+    return _schedule_index(state)["conflicts"].get(dkey, {})
+
+
+# ========== 출연자 인덱스 ==========
+# {"contents": {이름: [(날짜, cid)]}, "day_names": {날짜: {이름}}}
+# 일정 쪽은 일정 구간 인덱스의 performers를 그대로 사용
+
+def _clean_names(perf) -> List[str]:
+    return sorted({p.strip() for p in perf or [] if isinstance(p, str) and p.strip()})
+
+def _index_performer_day(index, dkey: str, items):
+    names = set()
+    for c in items or []:
+        if not isinstance(c, dict) or not c.get("id"):
+            continue
+        for name in _clean_names(c.get("performers")):
+            insort(index["contents"].setdefault(name, []), (dkey, c["id"]))
+            names.add(name)
+    if names:
+        index["day_names"][dkey] = names
+
+def rebuild_performers(state):
+    index = {"contents": {}, "day_names": {}}
+    for dkey, items in (state.get("daily_contents") or {}).items():
+        _index_performer_day(index, dkey, items)
+    state[PERFORMER_INDEX_KEY] = index
+    return index
+
+def _performer_index(state):
+    index = state.get(PERFORMER_INDEX_KEY)
+    return index if index is not None else rebuild_performers(state)
+
+def _day_slice(entries, start: str, end: str):
+    """날짜 키 첫 원소로 정렬된 튜플 목록에서 start~end(포함) 구간의 위치"""
+    return bisect_left(entries, (start,)), bisect_left(entries, (end + "\uffff",))
+
+def refresh_performers(state, dkeys):
+    index = _performer_index(state)
+    for dkey in set(dkeys):
+        if not dkey:
+            continue
+        for name in index["day_names"].pop(dkey, ()):
+            entries = index["contents"].get(name, [])
+            lo, hi = _day_slice(entries, dkey, dkey)
+            del entries[lo:hi]
+            if not entries:
+                index["contents"].pop(name, None)
+        _index_performer_day(index, dkey, (state.get("daily_contents") or {}).get(dkey))
+
+def performer_names(state) -> List[str]:
+    """콘텐츠나 일정에 한 번이라도 나온 출연자 (가나다순)"""
+    return sorted(set(_performer_index(state)["contents"]) | set(_schedule_index(state)["performers"]))
+
+def performer_contents(state, name: str, start: str, end: str) -> List[tuple]:
+    """start~end(포함, "YYYY-MM-DD") 사이 그 출연자의 (날짜, cid)"""
+    entries = _performer_index(state)["contents"].get(name, [])
+    lo, hi = _day_slice(entries, start, end)
+    return entries[lo:hi]
+
+def performer_schedules(state, name: str, start: str, end: str) -> List[tuple]:
+    """start~end(포함) 사이 그 출연자의 (날짜, 시작분, 종료분, 스케줄 위치)"""
+    entries = _schedule_index(state)["performers"].get(name, [])
+    lo, hi = _day_slice(entries, start, end)
+    return entries[lo:hi]
+
+
+# ========== 갱신 ==========
+
+def _touched_content_dates(op: str, args: Dict[str, Any]):
+    """콘텐츠 위치/제목이 바뀔 수 있는 날짜 키"""
+    if op in ("add_contents", "delete_content"):
+        return [args.get("date")]
+    if op == "update_content":
+        return [args.get("date")] if "title" in (args.get("fields") or {}) else []
+    if op == "move_content":
+        return [args.get("src"), args.get("dst")]
+    return []
+
+def _touched_dates(op: str, args: Dict[str, Any]):
+    """명령이 건드린 날짜 키"""
+    if op in ("add_contents", "delete_content", "add_schedule", "delete_schedule"):
+        return [args.get("date")]
+    if op == "move_content":
+        return [args.get("src"), args.get("dst")]
+    return []  # 내용 수정/상태/소품: 날짜 구성은 그대로
+
+def _touched_schedule_dates(op: str, args: Dict[str, Any]):
+    """구간/출연자 구성이 바뀔 수 있는 날짜 키 (연동 콘텐츠의 출연자 변경 포함)"""
+    if op in ("add_schedule", "update_schedule", "delete_schedule", "delete_content"):
+        return [args.get("date")]
+    if op == "update_content":
+        return [args.get("date")] if "performers" in (args.get("fields") or {}) else []
+    if op == "move_content":
+        return [args.get("src"), args.get("dst")]
+    return []
+
+def _touched_performer_dates(op: str, args: Dict[str, Any]):
+    """콘텐츠 출연자 구성이 바뀔 수 있는 날짜 키"""
+    if op in ("add_contents", "delete_content"):
+        return [args.get("date")]
+    if op == "update_content":
+        return [args.get("date")] if "performers" in (args.get("fields") or {}) else []
+    if op == "move_content":
+        return [args.get("src"), args.get("dst")]
+    return []
+
+def rebuild(state):
+    rebuild_dates(state)
+    rebuild_cids(state)
+    rebuild_pipeline(state)
+    rebuild_schedules(state)
+    rebuild_performers(state)
+
+def on_mutate(state, op: str, args: Dict[str, Any]):
+    """journal.apply 직후 호출: 바뀐 부분만 인덱스에 반영 (전체 교체면 다시 만듦)"""
+    if op == "replace_all":
+        rebuild(state)
+        return
+    touched = _touched_dates(op, args)
+    if touched:
+        refresh_dates(state, touched)
+    touched = _touched_content_dates(op, args)
+    if touched:
+        refresh_cids(state, touched)
+    if op == "set_status":
+        hits = (locate(state, cid) for cid in args.get("statuses") or {})
+        refresh_pipeline(state, [hit[0] for hit in hits if hit])
+    elif op in ("add_contents", "delete_content", "move_content"):
+        refresh_pipeline(state, touched)
+    touched = _touched_schedule_dates(op, args)
+    if touched:
+        refresh_schedules(state, touched)
+    touched = _touched_performer_dates(op, args)
+    if touched:
+        refresh_performers(state, touched)
+
+def with_position(state, op: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    id로 콘텐츠를 가리키는 명령에 인덱스의 현재 위치를 index로 채워 줌.
+    journal은 이 위치가 맞으면 목록을 훑지 않고 바로 사용.
+    """
+    if op not in ("update_content", "move_content", "delete_content") or not args.get("id"):
+        return args
+    hit = locate(state, args["id"])
+    if hit and hit[0] == args.get("date", args.get("src")):
+        args = dict(args, index=hit[1])
+    return args
@@ -0,0 +1,246 @@
+# modules/journal.py
+"""
+변경 저널: 모든 데이터 변경을 작은 명령({"op", "args"})으로 append-only 파일에 기록.
+- append는 한 줄 + fsync → 저장 실패/프로세스 종료에도 편집이 남음
+- 스냅샷이 원격에 반영되면 그 시점까지의 항목을 잘라냄(compact)
+- 시작 시 스냅샷 위에 남은 항목을 다시 적용(replay)
+streamlit에 의존하지 않음 (state는 세션 상태나 일반 dict 모두 가능)
+"""
+from __future__ import annotations
+import json, os, time, threading, hashlib
+from typing import Dict, Any, Callable, List
+
+from .models import to_minutes
+
+JOURNAL_PATH = "data_journal.jsonl"
+
+_lock = threading.Lock()
+_seq = None  # 마지막으로 기록한 순번 (파일에서 이어받음)
+
+
+# ========== 명령 ==========
+
+def _start_key(r: Dict[str, Any]) -> int:
+    return to_minutes(r.get("start") or "00:00")
+
+def sort_schedules(items: List[Dict[str, Any]]):
+    """시작시간 오름차순 정렬 (제자리)"""
+    items.sort(key=_start_key)
+
+def ensure_schedule_ids(state) -> int:
+    """
+    id 없는(레거시) 스케줄에 id 부여 (제자리). 부여한 개수 반환.
+    id는 날짜/위치/내용에서 만든 값이라 어느 세션·프로세스에서 붙여도 같음
+    """
+    n = 0
+    for dkey, day in (state.get("schedules") or {}).items():
+        for i, s in enumerate(day or []):
+            if isinstance(s, dict) and not s.get("id"):
+                blob = json.dumps([dkey, i, s], ensure_ascii=False, sort_keys=True)
+                s["id"] = hashlib.sha1(blob.encode("utf-8")).hexdigest()[:8]
+                n += 1
+    return n
+
+def _find(items, cid, index=None):
+    """id로 위치 찾기. index 위치의 id가 맞으면 훑지 않고 바로 사용, id가 없는(레거시) 항목은 index로"""
+    items = items or []
+    if cid:
+        if index is not None and 0 <= index < len(items) and items[index].get("id") == cid:
+            return index
+        return next((i for i, c in enumerate(items) if c.get("id") == cid), None)
+    if index is not None and 0 <= index < len(items) and not items[index].get("id"):
+        return index
+    return None
+
+def _find_schedule(day, index, before):
+    """index 위치의 항목이 기록 당시(before)와 같을 때만 대상 — 재적용 시 엉뚱한 항목을 건드리지 않도록"""
+    if not 0 <= index < len(day):
+        return None
+    cur = day[index]
+    if before is None or cur == before:
+        return index
+    if "id" not in before and {k: v for k, v in cur.items() if k != "id"} == before:
+        return index  # id를 붙이기 전에 기록된 항목
+    return None
+
+def _op_add_contents(state, date, items, status="촬영전"):
+    day = state["daily_contents"].setdefault(date, [])
+    have = {c.get("id") for c in day}
+    for c in items:
+        if c.get("id") in have:
+            continue  # 재적용(replay)해도 중복되지 않도록
+        day.append(c)
+        state["upload_status"][c["id"]] = status
+
+def _op_update_content(state, date, id, fields, index=None):
+    day = state["daily_contents"].get(date, [])
+    i = _find(day, id, index)
+    if i is not None:
+        day[i].update(fields)
+
+def _op_move_content(state, id, src, dst, index=None):
+    day = state["daily_contents"].get(src, [])
+    i = _find(day, id, index)
+    if i is None:
+        return
+    c = day.pop(i)
+    state["daily_contents"].setdefault(dst, []).append(c)
+    # 타임테이블 연동 함께 이동
+    old = state["schedules"].get(src, [])
+    keep, mv = [], []
+    for s in old:
+        (mv if id and s.get("cid") == id else keep).append(s)
+    state["schedules"][src] = keep
+    if mv:
+        state["schedules"].setdefault(dst, []).extend(mv)
+
+def _op_delete_content(state, date, id, index=None):
+    day = state["daily_contents"].get(date, [])
+    i = _find(day, id, index)
+    if i is not None:
+        day.pop(i)
+
+def _op_set_status(state, statuses):
+    state["upload_status"].update(statuses)
+
+def _op_add_prop(state, cid, prop):
+    items = state["content_props"].setdefault(cid, [])
+    if prop.get("id") and any(p.get("id") == prop["id"] for p in items):
+        return
+    items.append(prop)
+
+def _op_add_schedule(state, date, entry):
+    day = state["schedules"].setdefault(date, [])
+    if entry.get("id") and any(s.get("id") == entry["id"] for s in day):
+        return
+    day.append(entry)
+    sort_schedules(day)
+
+def _op_update_schedule(state, date, index, fields, before=None):
+    day = state["schedules"].get(date, [])
+    i = _find_schedule(day, index, before)
+    if i is not None:
+        day[i].update(fields)
+        sort_schedules(day)
+
+def _op_delete_schedule(state, date, index, before=None):
+    day = state["schedules"].get(date, [])
+    i = _find_schedule(day, index, before)
+    if i is not None:
+        day.pop(i)
+
+def _op_replace_all(state, data):
+    for k in ["daily_contents", "content_props", "schedules", "upload_status"]:
+        if k in data:
+            state[k] = data[k]
+    ensure_schedule_ids(state)  # 가져온 레거시 스케줄도 id로 가리키도록
+
+OPS: Dict[str, Callable] = {
+    "add_contents": _op_add_contents,
+    "update_content": _op_update_content,
+    "move_content": _op_move_content,
+    "delete_content": _op_delete_content,
+    "set_status": _op_set_status,
+    "add_prop": _op_add_prop,
+    "add_schedule": _op_add_schedule,
+    "update_schedule": _op_update_schedule,
+    "delete_schedule": _op_delete_schedule,
+    "replace_all": _op_replace_all,
+}
+
+def apply(state, op: str, args: Dict[str, Any]):
+    """명령 하나를 state에 적용. 모든 명령은 다시 적용해도 결과가 같도록 작성됨"""
+    for k in ["daily_contents", "content_props", "schedules", "upload_status"]:
+        if state.get(k) is None:
+            state[k] = {}
+    OPS[op](state, **args)
+
+
+# ========== 파일 ==========
+
+def _read_all() -> List[Dict[str, Any]]:
+    """저널 전체. 마지막 줄이 쓰다 만 상태(크래시)면 무시"""
+    if not os.path.exists(JOURNAL_PATH):
+        return []
+    out = []
+    with open(JOURNAL_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                break
+    return out
+
+def _next_seq() -> int:
+    global _seq
+    if _seq is None:
+        _seq = max((e.get("seq", 0) for e in _read_all()), default=0)
+    _seq += 1
+    return _seq
+
+def append(op: str, args: Dict[str, Any], origin: str | None = None) -> int:
+    """명령을 한 줄 추가하고 fsync. 기록한 순번 반환"""
+    if op not in OPS:
+        raise ValueError(f"알 수 없는 명령: {op}")
+    with _lock:
+        seq = _next_seq()
+        line = json.dumps({"seq": seq, "ts": time.time(), "origin": origin, "op": op, "args": args},
+                          ensure_ascii=False, separators=(",", ":"))
+        with open(JOURNAL_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return seq
+
+def last_seq() -> int:
+    with _lock:
+        if _seq is None:
+            return max((e.get("seq", 0) for e in _read_all()), default=0)
+        return _seq
+
+def entries() -> List[Dict[str, Any]]:
+    with _lock:
+        return _read_all()
+
+def _marked(e: Dict[str, Any], marks: Dict[Any, int]) -> bool:
+    """marks={origin: 순번}: 그 세션 항목 중 순번까지 (origin None이면 모든 세션)"""
+    seq = e.get("seq", 0)
+    if None in marks and seq <= marks[None]:
+        return True
+    o = e.get("origin")
+    return o is not None and o in marks and seq <= marks[o]
+
+def replay(state, marks: Dict[Any, int] | None = None) -> int:
+    """남아 있는(아직 원격에 반영되지 않은) 명령을 state에 다시 적용. marks가 있으면 그 범위만. 적용 개수 반환"""
+    ensure_schedule_ids(state)  # 기록된 before에는 id가 있음
+    n = 0
+    for e in entries():
+        if marks is not None and not _marked(e, marks):
+            continue
+        try:
+            apply(state, e["op"], e.get("args") or {})
+            n += 1
+        except Exception:
+            continue
+    ensure_schedule_ids(state)  # id 없이 기록된 예전 add_schedule
+    return n
+
+def compact(origin: str | None, through_seq: int):
+    """
+    through_seq까지 반영된 스냅샷이 저장된 뒤 호출.
+    origin 세션의 항목(origin=None이면 전부)을 잘라내고 나머지만 임시 파일로 다시 써서 교체.
+    """
+    with _lock:
+        rest = [e for e in _read_all()
+                if e.get("seq", 0) > through_seq or (origin is not None and e.get("origin") != origin)]
+        if not rest:
+            if os.path.exists(JOURNAL_PATH):
+                os.remove(JOURNAL_PATH)
+            return
+        tmp = JOURNAL_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for e in rest:
+                f.write(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, JOURNAL_PATH)
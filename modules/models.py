@@ -0,0 +1,109 @@
+# modules/models.py
+"""
+도메인 모델 (읽기용). 저장/저널/동기화는 지금처럼 JSON dict를 그대로 쓰고,
+화면에서는 repository가 한 번 변환해 둔 이 객체들을 읽음 → 렌더링 루프마다 .get()/기본값 처리 반복 없음.
+__slots__ 데이터클래스라 인스턴스마다 __dict__가 없음.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+CONTENT_TEXT_FIELDS = ("title", "draft", "revision", "feedback", "final", "reference")
+
+
+def _text(v) -> str:
+    return "" if v is None else str(v)
+
+@lru_cache(maxsize=2048)
+def to_minutes(t: str) -> int:
+    """"HH:MM" → 자정부터의 분. 잘못된 값은 0"""
+    try:
+        hh, mm = t.split(":")
+        return int(hh)*60 + int(mm)
+    except Exception:
+        return 0
+
+def minutes_text(m: int) -> str:
+    return f"{m // 60:02d}:{m % 60:02d}"
+
+def _int(v, default: int) -> int:
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(slots=True)
+class Content:
+    id: Optional[str]
+    title: str = ""
+    performers: List[str] = field(default_factory=list)
+    draft: str = ""
+    revision: str = ""
+    feedback: str = ""
+    final: str = ""
+    reference: str = ""
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Content":
+        perf = d.get("performers") or []
+        if isinstance(perf, str):
+            perf = [x.strip() for x in perf.split(",") if x.strip()]
+        return cls(id=d.get("id"), performers=[str(x) for x in perf],
+                   **{k: _text(d.get(k)) for k in CONTENT_TEXT_FIELDS})
+
+    @property
+    def performers_text(self) -> str:
+        return ", ".join(self.performers)
+
+
+@dataclass(slots=True)
+class Prop:
+    id: Optional[str]
+    name: str = ""
+    vendor: str = ""
+    quantity: int = 1
+    status: str = "예정"
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Prop":
+        return cls(id=d.get("id"), name=_text(d.get("name")), vendor=_text(d.get("vendor")),
+                   quantity=_int(d.get("quantity"), 1), status=_text(d.get("status") or "예정"))
+
+
+@dataclass(slots=True)
+class ScheduleEntry:
+    """start/end는 자정부터의 분(int). "HH:MM" 문자열은 저장 파일과 화면 표시에서만"""
+    id: Optional[str]
+    start: int = 0
+    end: int = 0
+    type: str = "촬영"
+    title: str = ""
+    details: str = ""
+    cid: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ScheduleEntry":
+        return cls(id=d.get("id"), start=to_minutes(_text(d.get("start") or "00:00")),
+                   end=to_minutes(_text(d.get("end") or "00:00")),
+                   type=_text(d.get("type") or "촬영"), title=_text(d.get("title")),
+                   details=_text(d.get("details")), cid=d.get("cid"))
+
+    @property
+    def start_text(self) -> str:
+        return minutes_text(self.start)
+
+    @property
+    def end_text(self) -> str:
+        return minutes_text(self.end)
+
+    @property
+    def time_range(self) -> str:
+        return f"{self.start_text}~{self.end_text}"
+
+
+@dataclass(slots=True)
+class UploadState:
+    cid: Optional[str]
+    status: str = "촬영전"
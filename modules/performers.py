@@ -0,0 +1,103 @@
+# modules/performers.py
+from __future__ import annotations
+import streamlit as st
+import pandas as pd
+from datetime import date, timedelta
+from typing import Dict, Any, List
+
+from modules import indexes, repository
+from .models import minutes_text
+from .ui import to_datestr, parse_date
+
+STATES = ["촬영전", "촬영완료", "편집완료", "업로드완료"]
+
+
+def _week_label(dkey: str) -> str:
+    d = parse_date(dkey)
+    if not d:
+        return dkey
+    monday = d - timedelta(days=d.weekday())
+    return f"{monday.strftime('%m/%d')} 주"
+
+def _summary_rows(names: List[str], start: str, end: str) -> List[Dict[str, Any]]:
+    """출연자별 기간 요약 (인덱스 구간만 읽음)"""
+    rows = []
+    for name in names:
+        contents = indexes.performer_contents(st.session_state, name, start, end)
+        scheds = indexes.performer_schedules(st.session_state, name, start, end)
+        if not contents and not scheds:
+            continue
+        row = {"출연자": name, "콘텐츠": len(contents), "일정": len(scheds),
+               "촬영 시간(분)": sum(e - s for _, s, e, _ in scheds)}
+        for status in STATES:
+            row[status] = 0
+        for _, cid in contents:
+            status = repository.upload_state(st.session_state, cid).status
+            row[status] = row.get(status, 0) + 1
+        rows.append(row)
+    return rows
+
+def render():
+    st.subheader("👥 출연자 일정")
+
+    names = indexes.performer_names(st.session_state)
+    if not names:
+        st.info("출연자가 등록된 콘텐츠가 없습니다. 기획 탭에서 출연자를 입력하세요.")
+        return
+
+    c1, c2 = st.columns([1, 1.4])
+    with c1:
+        today = date.today()
+        rng = st.date_input("기간", value=(today, today + timedelta(days=30)), key="perf_range", format="YYYY/MM/DD")
+    start_d, end_d = (rng if isinstance(rng, (tuple, list)) and len(rng) == 2 else (today, today + timedelta(days=30)))
+    start, end = to_datestr(start_d), to_datestr(end_d)
+
+    # 전체 요약
+    rows = _summary_rows(names, start, end)
+    if not rows:
+        st.info("이 기간에 출연 일정이 없습니다.")
+        return
+    st.markdown("### 📊 기간 요약")
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+    # 한 사람 상세
+    with c2:
+        name = st.selectbox("출연자", [r["출연자"] for r in rows], key="perf_name")
+
+    st.markdown(f"### 🎬 {name} 촬영 일정")
+    scheds = indexes.performer_schedules(st.session_state, name, start, end)
+    if scheds:
+        shoot_rows = []
+        for dkey, s, e, pos in scheds:
+            day = repository.schedules(st.session_state, dkey)
+            entry = day[pos] if pos < len(day) else None
+            shoot_rows.append({
+                "날짜": dkey,
+                "시간": f"{minutes_text(s)}~{minutes_text(e)}",
+                "유형": entry.type if entry else "",
+                "제목": (entry.title if entry else "") or "(제목없음)",
+            })
+        st.dataframe(pd.DataFrame(shoot_rows), use_container_width=True, hide_index=True)
+
+        # 주별 촬영 시간
+        weekly: Dict[str, int] = {}
+        for dkey, s, e, _ in scheds:
+            week = _week_label(dkey)
+            weekly[week] = weekly.get(week, 0) + (e - s)
+        st.markdown("#### ⏱️ 주별 촬영 시간(분)")
+        st.bar_chart(pd.Series(weekly, name="분"))
+    else:
+        st.caption("타임테이블에 잡힌 일정이 없습니다.")
+
+    st.markdown(f"### 📋 {name} 출연 콘텐츠")
+    content_rows = []
+    for dkey, cid in indexes.performer_contents(st.session_state, name, start, end):
+        c = repository.content(st.session_state, cid)
+        if c is None:
+            continue
+        content_rows.append({"날짜": dkey, "제목": c.title or "(제목 없음)",
+                             "상태": repository.upload_state(st.session_state, cid).status})
+    if content_rows:
+        st.dataframe(pd.DataFrame(content_rows), use_container_width=True, hide_index=True)
+    else:
+        st.caption("이 기간에 출연 콘텐츠가 없습니다.")
@@ -1,29 +1,21 @@
 # modules/planning.py
 from __future__ import annotations
 import streamlit as st
-from datetime import datetime, date
+from datetime import date
 import uuid
 from typing import List, Dict, Any
 
-from modules import storage
+from modules import storage, indexes, repository, search, widgets
 # 최신 토글 달력 + 오늘 기준 최근 날짜 + 날짜 문자열 변환
-from .ui import date_picker_with_toggle, nearest_anchor_date_today, to_datestr
+from .ui import (date_picker_with_toggle, nearest_anchor_date_today, to_datestr, parse_date,
+                 edit_session_on, page_window, PAGE_SIZE)
 
 
 # ---------- 내부 유틸 ----------
 
 def _collect_days() -> List[date]:
-    """콘텐츠가 하나라도 있는 날짜만 수집해 정렬"""
-    dc = st.session_state.get("daily_contents", {}) or {}
-    days: List[date] = []
-    for k, v in dc.items():
-        if not v:
-            continue
-        try:
-            days.append(datetime.strptime(k, "%Y-%m-%d").date())
-        except Exception:
-            pass
-    return sorted(set(days))
+    """콘텐츠가 하나라도 있는 날짜(정렬) — 공용 날짜 인덱스 사용"""
+    return indexes.dates(st.session_state, "contents")
 
 
 def _ensure_state():
@@ -36,11 +28,74 @@ def _ensure_state():
         st.session_state.plan_selected = nearest_anchor_date_today()
 
 
+def _render_search():
+    """전체 기간 기획안 검색 → 결과에서 해당 날짜로 이동"""
+    with st.expander("🔎 전체 기획안 검색", expanded=False):
+        q = st.text_input("검색어", placeholder="제목, 출연자, 초안, 최종안, 참고 링크…", key="plan_search_q")
+        if not q.strip():
+            return
+        results = search.search(st.session_state, q)
+        if not results:
+            st.info("검색 결과가 없습니다.")
+            return
+        st.caption(f"{len(results)}건")
+        for r in results:
+            c1, c2 = st.columns([5, 1])
+            with c1:
+                st.markdown(f"**{r['title']}** · {r['date']}")
+                if r["snippet"]:
+                    st.caption(r["snippet"])
+            with c2:
+                st.button("이동", key=f"plan_search_go_{r['cid']}", use_container_width=True,
+                          on_click=_go_to_date, args=(r["date"], r["cid"]))
+
+
+# ---------- 버튼 콜백 ----------
+# 콜백은 스크립트 본문보다 먼저 실행됨 → 변경이 바로 이번 렌더에 반영 (mutate 후 st.rerun으로 두 번 그리지 않음)
+
+def _go_to_date(dkey: str, cid: str | None = None):
+    d = parse_date(dkey)
+    if d:
+        # 날짜 선택기 상태까지 함께 바꿔야 이동함
+        st.session_state.plan_selected = d
+        st.session_state["planning_selected"] = d
+        hit = indexes.locate(st.session_state, cid)
+        if hit:
+            st.session_state[f"plan_{dkey}_page"] = hit[1] // PAGE_SIZE  # 그 콘텐츠가 있는 쪽
+
+def _add_templates(dkey: str):
+    items = []
+    for i in range(int(st.session_state.get("plan_new_count", 3))):
+        cid = str(uuid.uuid4())[:8]
+        items.append({
+            "id": cid,
+            "title": "",
+            "performers": [],
+            # 본문 탭 필드
+            "draft": "",
+            "revision": "",
+            "feedback": "",
+            "final": "",
+            # 참고 링크(줄바꿈 구분)
+            "reference": "",
+        })
+    # 새 양식이 보이도록 첫 새 양식이 있는 쪽으로
+    st.session_state[f"plan_{dkey}_page"] = len(repository.contents(st.session_state, dkey)) // PAGE_SIZE
+    storage.mutate("add_contents", date=dkey, items=items, status="촬영전")
+
+def _move_content(dkey: str, cid: str, ref: Dict[str, Any]):
+    """대상 날짜로 이동 (타임테이블 연동 항목도 함께)"""
+    dst = st.session_state.get(f"mv_date_{cid}")
+    if dst:
+        storage.mutate("move_content", src=dkey, dst=to_datestr(dst), **ref)
+
+
 # ---------- 메인 렌더 ----------
 
 def render():
     _ensure_state()
     st.subheader("📝 콘텐츠 기획")
+    _render_search()
 
     # ===== 상단: 최신 토글 달력(마커) =====
     # ❗ 여기 수정: label= 키워드 사용하지 말고 첫 번째 인자로 문자열 전달
@@ -65,7 +120,7 @@ def render():
         st.write(d.strftime("%Y/%m/%d"))
 
     with a2:
-        count = st.number_input(
+        st.number_input(
             label="개수",
             min_value=1,
             max_value=20,
@@ -76,101 +131,108 @@ def render():
         )
 
     with a3:
-        if st.button("✨ 양식 추가", use_container_width=True, key="btn_add_templates"):
-            st.session_state["daily_contents"].setdefault(dkey, [])
-            base = len(st.session_state["daily_contents"][dkey])
-            for i in range(int(count)):
-                cid = str(uuid.uuid4())[:8]
-                st.session_state["daily_contents"][dkey].append({
-                    "id": cid,
-                    "title": "",
-                    "performers": [],
-                    # 본문 탭 필드
-                    "draft": "",
-                    "revision": "",
-                    "feedback": "",
-                    "final": "",
-                    # 참고 링크(줄바꿈 구분)
-                    "reference": "",
-                })
-                st.session_state["upload_status"][cid] = "촬영전"
-            storage.autosave_maybe()
-            st.rerun()
+        st.button("✨ 양식 추가", use_container_width=True, key="btn_add_templates",
+                  on_click=_add_templates, args=(dkey,))
 
     st.divider()
 
     # ===== 콘텐츠 카드들 =====
-    contents: List[Dict[str, Any]] = st.session_state["daily_contents"].get(dkey, [])
+    contents = repository.contents(st.session_state, dkey)
     if not contents:
         st.info("이 날짜에 콘텐츠가 없습니다.")
         return
 
     st.subheader(f"📋 {d.strftime('%m월 %d일')} 콘텐츠")
-    for idx, c in enumerate(contents):
-        cid = c.get("id", f"{dkey}_{idx}")
-        with st.expander(f"#{idx+1}. {c.get('title','제목 없음')}", expanded=False):
-
-            # 상단 한 줄: 제목 / 이동 날짜 / 이동 / 삭제
-            r1c1, r1c2, r1c3, r1c4 = st.columns([3, 1.3, 0.8, 0.2])
-
-            with r1c1:
-                c["title"] = st.text_input("제목", value=c.get("title", ""), key=f"title_{cid}")
-
-            with r1c2:
-                mv_date = st.date_input("이동 날짜", value=d, key=f"mv_date_{cid}", format="YYYY/MM/DD")
-
-            with r1c3:
-                st.markdown("<div style='height: 10px'></div>", unsafe_allow_html=True)
-                if st.button("이동", key=f"btn_move_{cid}"):
-                    # 현재 날짜 리스트에서 제거
-                    st.session_state["daily_contents"][dkey].pop(idx)
-                    new_key = to_datestr(mv_date)
-                    # 대상 날짜로 추가
-                    st.session_state["daily_contents"].setdefault(new_key, []).append(c)
-                    # 타임테이블 연동 함께 이동
-                    old = st.session_state.get("schedules", {}).get(dkey, [])
-                    keep, mv = [], []
-                    for s in old:
-                        (mv if s.get("cid") == cid else keep).append(s)
-                    st.session_state["schedules"][dkey] = keep
-                    if mv:
-                        st.session_state["schedules"].setdefault(new_key, []).extend(mv)
-                    storage.autosave_maybe()
-                    st.rerun()
-
-            with r1c4:
-                st.markdown("<div style='height: 10px'></div>", unsafe_allow_html=True)
-                if st.button("🗑️", key=f"btn_del_{cid}"):
-                    st.session_state["daily_contents"][dkey].pop(idx)
-                    storage.autosave_maybe()
-                    st.rerun()
-
-            # 출연자 / 참고 링크
-            b1, b2 = st.columns([1.2, 2.8])
-            with b1:
-                perf_raw = st.text_input(
-                    "출연자(콤마)",
-                    value=", ".join(c.get("performers", [])),
-                    key=f"perf_{cid}",
-                )
-                c["performers"] = [x.strip() for x in perf_raw.split(",") if x.strip()]
-            with b2:
-                c["reference"] = st.text_area(
-                    "참고 링크(줄바꿈)",
-                    value=c.get("reference", ""),
-                    height=100,
-                    key=f"ref_{cid}",
-                )
-
-            # 본문 탭: 초안/의견/피드백/최종안
-            tab1, tab2, tab3, tab4 = st.tabs(["초안", "의견", "피드백", "최종안"])
-            with tab1:
-                c["draft"] = st.text_area("초안", value=c.get("draft", ""), height=300, key=f"draft_{cid}")
-            with tab2:
-                c["revision"] = st.text_area("의견", value=c.get("revision", ""), height=160, key=f"rev_{cid}")
-            with tab3:
-                c["feedback"] = st.text_area("피드백", value=c.get("feedback", ""), height=160, key=f"fb_{cid}")
-            with tab4:
-                c["final"] = st.text_area("최종안", value=c.get("final", ""), height=160, key=f"final_{cid}")
-
-            st.caption("텍스트 변경은 주기 저장으로 자동 반영됩니다.")
+    start, end = page_window(len(contents), f"plan_{dkey}")
+    for idx in range(start, end):
+        c = contents[idx]
+        with st.expander(f"#{idx+1}. {c.title or '제목 없음'}", expanded=False):
+            _content_card(dkey, d, idx, c.id)
+            _card_actions(dkey, d, idx, c.id)
+
+
+def _card_actions(dkey: str, d: date, idx: int, content_id: str | None):
+    """이동/삭제 (구조 변경이라 카드 조각 밖: 콜백으로 처리하고 전체를 한 번만 다시 그림)"""
+    cid = widgets.content_key(dkey, idx, content_id)
+    # 저널 명령에서 콘텐츠를 가리키는 방법: id, 없으면(레거시) 위치
+    ref = {"id": content_id, "index": idx}
+    _, m1, m2, m3 = st.columns([3, 1.3, 0.8, 0.2])
+    with m1:
+        st.date_input("이동 날짜", value=d, key=f"mv_date_{cid}", format="YYYY/MM/DD")
+    with m2:
+        st.markdown("<div style='height: 10px'></div>", unsafe_allow_html=True)
+        st.button("이동", key=f"btn_move_{cid}", on_click=_move_content, args=(dkey, cid, ref))
+    with m3:
+        st.markdown("<div style='height: 10px'></div>", unsafe_allow_html=True)
+        st.button("🗑️", key=f"btn_del_{cid}", on_click=storage.mutate, args=("delete_content",),
+                  kwargs=dict(date=dkey, **ref))
+
+
+@st.fragment
+def _content_card(dkey: str, d: date, idx: int, content_id: str | None):
+    """
+    콘텐츠 카드 하나의 입력란 (부분 리런 단위).
+    텍스트 수정은 이 카드만 다시 실행하고 저장 요청. 이동/삭제는 _card_actions.
+    """
+    contents = repository.contents(st.session_state, dkey)
+    if content_id:
+        hit = indexes.locate(st.session_state, content_id)
+        if not hit or hit[0] != dkey:
+            return  # 다른 곳에서 이동/삭제됨 → 다음 전체 리런 때 목록에서 빠짐
+        idx = hit[1]
+    elif idx >= len(contents):
+        return
+    c = contents[idx]
+    cid = widgets.content_key(dkey, idx, c.id)
+    # 저널 명령에서 콘텐츠를 가리키는 방법: id, 없으면(레거시) 위치
+    ref = {"id": c.id, "index": idx}
+    edits: Dict[str, Any] = {}
+    editing = edit_session_on()
+
+    if editing:
+        st.caption("✍️ 편집 세션: 💾 저장을 눌러야 반영됩니다.")
+
+    body = st.form(f"form_{cid}", border=False) if editing else st.container()
+    with body:
+        edits["title"] = st.text_input("제목", value=c.title, key=f"title_{cid}")
+
+        # 출연자 / 참고 링크
+        b1, b2 = st.columns([1.2, 2.8])
+        with b1:
+            perf_raw = st.text_input(
+                "출연자(콤마)",
+                value=c.performers_text,
+                key=f"perf_{cid}",
+            )
+            edits["performers"] = [x.strip() for x in perf_raw.split(",") if x.strip()]
+        with b2:
+            edits["reference"] = st.text_area(
+                "참고 링크(줄바꿈)",
+                value=c.reference,
+                height=100,
+                key=f"ref_{cid}",
+            )
+
+        # 본문 탭: 초안/의견/피드백/최종안
+        tab1, tab2, tab3, tab4 = st.tabs(["초안", "의견", "피드백", "최종안"])
+        with tab1:
+            edits["draft"] = st.text_area("초안", value=c.draft, height=300, key=f"draft_{cid}")
+        with tab2:
+            edits["revision"] = st.text_area("의견", value=c.revision, height=160, key=f"rev_{cid}")
+        with tab3:
+            edits["feedback"] = st.text_area("피드백", value=c.feedback, height=160, key=f"fb_{cid}")
+        with tab4:
+            edits["final"] = st.text_area("최종안", value=c.final, height=160, key=f"final_{cid}")
+
+        submitted = st.form_submit_button("💾 저장", type="primary") if editing else True
+
+    # 바뀐 필드만 한 번에 기록 (카드 제목 등 바깥 표시는 다음 전체 리런 때 반영)
+    if submitted:
+        changed = {k: v for k, v in edits.items() if v != getattr(c, k)}
+        if changed:
+            storage.mutate("update_content", date=dkey, fields=changed, **ref)
+            if editing:
+                st.toast(f"저장됨: {', '.join(changed)}")
+
+    if not editing:
+        st.caption("텍스트 변경은 이 카드만 다시 그리고 주기 저장으로 자동 반영됩니다.")
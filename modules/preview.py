@@ -0,0 +1,43 @@
+# modules/preview.py
+"""
+기획안 미리보기 (최종안, 없으면 "(초안) " + 초안). 대시보드 표와 타임테이블 세부 내용이 같이 씀.
+- 결과는 (콘텐츠 ID, 원문, 줄 수, 방식) LRU 캐시 → 같은 글이면 리런마다 다시 자르고 잇지 않음
+  (원문 문자열의 해시는 파이썬이 문자열 객체에 저장해 두므로 키 비교가 싸다)
+- source_key(): 미리보기가 바뀔 수 있는지 보는 값 (최종안, 초안). 이전 값과 같으면 미리보기도 같음
+streamlit에 의존하지 않음
+"""
+from __future__ import annotations
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from .models import Content
+
+DRAFT_PREFIX = "(초안) "
+
+
+@lru_cache(maxsize=1024)
+def _render(cid: Optional[str], text: str, max_lines: Optional[int], compact: bool) -> str:
+    """
+    compact=True: 줄 앞뒤 공백과 빈 줄 제거 (대시보드)
+    compact=False: 줄 끝 공백만 제거, 빈 줄 유지 (타임테이블 세부 내용)
+    """
+    if compact:
+        lines = [ln for ln in (ln.strip() for ln in text.splitlines()) if ln]
+    else:
+        lines = [ln.rstrip() for ln in text.splitlines()]
+    if max_lines is not None:
+        lines = lines[:max_lines]
+    return "\n".join(lines)
+
+def source_key(content: Content) -> Tuple[str, str]:
+    return (content.final, content.draft)
+
+def final_or_draft(content: Content, max_lines: Optional[int] = None, compact: bool = True) -> str:
+    """최종안이 있으면 최종안, 없으면 (초안) + 초안, 둘 다 없으면 빈 문자열"""
+    final = content.final.strip()
+    if final:
+        return _render(content.id, final, max_lines, compact)
+    draft = content.draft.strip()
+    if draft:
+        return DRAFT_PREFIX + _render(content.id, draft, max_lines, compact)
+    return ""
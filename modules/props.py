@@ -2,8 +2,11 @@
 from __future__ import annotations
 import streamlit as st
 import pandas as pd
+import uuid
+from datetime import timedelta
+from typing import List
 from .ui import date_picker_with_toggle, nearest_anchor_date_today, to_datestr, DOT
-from modules import storage
+from modules import storage, repository, indexes
 
 # 간단한 상태 정보 (아이콘만)
 STATUS_ICONS = {
@@ -12,6 +15,90 @@ STATUS_ICONS = {
     "수령완료": "✅"
 }
 
+INVALID_NAMES = ["ㅇ", "ㅇㅇ", ""]
+FRAME_COLUMNS = ["날짜", "콘텐츠", "소품명", "구매처", "수량", "상태"]
+
+
+def _props_frame(dkeys: List[str]) -> pd.DataFrame:
+    """날짜들의 소품을 한 줄씩 펼친 표. 정리/필터는 열 단위(벡터)로"""
+    dc = st.session_state.get("daily_contents", {}) or {}
+    cp = st.session_state.get("content_props", {}) or {}
+    records = [
+        (dkey, c.get("title") or f"콘텐츠 #{i+1}", p.get("name"), p.get("vendor"), p.get("quantity", 1), p.get("status"))
+        for dkey in dkeys
+        for i, c in enumerate(dc.get(dkey) or [])
+        for p in cp.get(c.get("id"), []) or []
+    ]
+    df = pd.DataFrame.from_records(records, columns=FRAME_COLUMNS)
+    if df.empty:
+        return df
+    # 특수문자 정리 + 유효한 이름만
+    for col in ["소품명", "구매처"]:
+        df[col] = df[col].fillna("").astype(str).str.replace(r"[\[\]]", "", regex=True).str.strip()
+    df = df[~df["소품명"].isin(INVALID_NAMES)].copy()
+    df["구매처"] = df["구매처"].replace("", "기타")
+    df["수량"] = pd.to_numeric(df["수량"], errors="coerce").fillna(1).astype(int)
+    df["상태"] = df["상태"].fillna("예정").replace("", "예정")
+    return df
+
+def _shopping_list(df: pd.DataFrame) -> pd.DataFrame:
+    """정규화한 소품명(대소문자/공백 무시) + 구매처로 묶어 수량 합계와 상태별 수량"""
+    df = df.assign(_key=df["소품명"].str.lower().str.replace(r"\s+", "", regex=True))
+    keys = ["_key", "구매처"]
+    out = df.groupby(keys, sort=False).agg(
+        소품명=("소품명", "first"),
+        수량=("수량", "sum"),
+        콘텐츠수=("콘텐츠", "nunique"),
+        첫날짜=("날짜", "min"),
+        콘텐츠=("콘텐츠", lambda s: ", ".join(dict.fromkeys(s))),
+    )
+    by_status = df.pivot_table(index=keys, columns="상태", values="수량", aggfunc="sum", fill_value=0)
+    by_status = by_status.reindex(columns=list(STATUS_ICONS), fill_value=0)
+    out = out.join(by_status).reset_index()
+    out["남은수량"] = out["수량"] - out["수령완료"]
+    out = out.sort_values(["첫날짜", "구매처", "소품명"])
+    return out[["소품명", "구매처", "수량", *STATUS_ICONS, "남은수량", "콘텐츠수", "첫날짜", "콘텐츠"]]
+
+def _render_shopping_list(anchor):
+    """기간 통합 구매 목록 (주 단위 장보기용)"""
+    st.markdown("---")
+    st.header("🧾 기간 통합 구매 목록")
+    rng = st.date_input("기간", value=(anchor, anchor + timedelta(days=6)), key="props_range", format="YYYY/MM/DD")
+    if not (isinstance(rng, (tuple, list)) and len(rng) == 2):
+        st.caption("시작일과 종료일을 모두 선택하세요.")
+        return
+    days = indexes.dates_between(st.session_state, rng[0], rng[1])
+    df = _props_frame([to_datestr(x) for x in days])
+    if df.empty:
+        st.info("📌 이 기간에 등록된 소품이 없습니다.")
+        return
+    shop = _shopping_list(df)
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        st.metric("품목", f"{len(shop)}개")
+    with c2:
+        st.metric("총 수량", f"{int(shop['수량'].sum())}개")
+    with c3:
+        st.metric("남은 수량", f"{int(shop['남은수량'].sum())}개")
+    st.dataframe(shop, use_container_width=True, hide_index=True)
+    st.download_button(
+        "⬇️ CSV 내보내기",
+        data=shop.to_csv(index=False).encode("utf-8-sig"),  # 엑셀에서 한글이 깨지지 않도록 BOM
+        file_name=f"shopping_{to_datestr(rng[0])}_{to_datestr(rng[1])}.csv",
+        mime="text/csv",
+        key="props_csv",
+    )
+
+def _add_prop(cid: str):
+    """소품 추가 콜백 (본문보다 먼저 실행 → 한 번만 다시 그림)"""
+    name = st.session_state.get(f"pn_{cid}", "")
+    if not name.strip():  # 소품명이 비어있지 않은 경우만
+        return
+    prop = {"id": str(uuid.uuid4())[:8], "name": name, "vendor": st.session_state.get(f"pv_{cid}", ""),
+            "quantity": st.session_state.get(f"pq_{cid}", 1), "status": st.session_state.get(f"ps_{cid}", "예정")}
+    storage.mutate("add_prop", cid=cid, prop=prop)
+    st.toast("소품이 추가되었습니다!")
+
 def render():
     """
     간단하고 깔끔한 소품 관리 인터페이스
@@ -23,43 +110,40 @@ def render():
     d = date_picker_with_toggle("📅 날짜 선택", key="props", default=nearest_anchor_date_today())
     dkey = to_datestr(d)
 
-    contents = st.session_state.get("daily_contents", {}).get(dkey, [])
+    contents = repository.contents(st.session_state, dkey)
     if not contents:
         st.info("📌 이 날짜에 등록된 콘텐츠가 없습니다.")
+        _render_shopping_list(d)
         return
 
     # 소품 추가 섹션
     with st.expander("➕ 소품 추가하기", expanded=False):
         st.markdown("### 🛒 새 소품 등록")
         for i, c in enumerate(contents):
-            cid = c.get("id")
-            with st.expander(f"📋 #{i+1}. {c.get('title','(제목 없음)')}", expanded=False):
-                items = st.session_state.setdefault("content_props", {}).setdefault(cid, [])
+            cid = c.id
+            with st.expander(f"📋 #{i+1}. {c.title or '(제목 없음)'}", expanded=False):
+                items = repository.props(st.session_state, cid)
                 
                 # 모던한 입력 폼 레이아웃
                 col1, col2, col3, col4 = st.columns([2, 2, 1, 1.2])
                 with col1: 
-                    name = st.text_input("소품명", placeholder="예: 카메라 거치대", key=f"pn_{cid}")
+                    st.text_input("소품명", placeholder="예: 카메라 거치대", key=f"pn_{cid}")
                 with col2: 
-                    vendor = st.text_input("구매처", placeholder="예: 쿠팡", key=f"pv_{cid}")
+                    st.text_input("구매처", placeholder="예: 쿠팡", key=f"pv_{cid}")
                 with col3: 
-                    qty = st.number_input("개수", min_value=1, value=1, step=1, key=f"pq_{cid}")
+                    st.number_input("개수", min_value=1, value=1, step=1, key=f"pq_{cid}")
                 with col4: 
-                    status = st.selectbox("상태", ["예정", "주문완료", "수령완료"], key=f"ps_{cid}")
+                    st.selectbox("상태", ["예정", "주문완료", "수령완료"], key=f"ps_{cid}")
                 
-                if st.button("✅ 추가하기", key=f"pa_{cid}", use_container_width=True):
-                    if name.strip():  # 소품명이 비어있지 않은 경우만
-                        items.append({"name": name, "vendor": vendor, "quantity": qty, "status": status})
-                        storage.autosave_maybe()
-                        st.success("소품이 추가되었습니다!")
-                        st.rerun()
+                st.button("✅ 추가하기", key=f"pa_{cid}", use_container_width=True,
+                          on_click=_add_prop, args=(cid,))
 
                 # 등록된 소품 목록
                 if items:
                     st.markdown("#### 📋 등록된 소품")
                     for j, p in enumerate(items):
-                        status_icon = STATUS_ICONS.get(p.get('status', '예정'), '⏳')
-                        st.markdown(f"**{j+1}.** {p.get('name', '')} | {p.get('vendor', '')} | {p.get('quantity', 1)}개 | {status_icon} {p.get('status', '예정')}")
+                        status_icon = STATUS_ICONS.get(p.status, '⏳')
+                        st.markdown(f"**{j+1}.** {p.name} | {p.vendor} | {p.quantity}개 | {status_icon} {p.status}")
                 else:
                     st.info("등록된 소품이 없습니다.")
 
@@ -68,43 +152,12 @@ def render():
     st.header(f"📊 {d.strftime('%m월 %d일')} 소품 현황")
     
     # 전체 소품 데이터를 한 번에 수집하여 간단한 표로 표시
-    all_props = []
-    total_count = 0
-    completed_count = 0
-    
-    for i, c in enumerate(contents):
-        cid = c.get("id")
-        items = st.session_state.get("content_props", {}).get(cid, [])
-        content_title = c.get('title', f'콘텐츠 #{i+1}')
-        
-        for p in items:
-            name = str(p.get('name', '')).strip()
-            vendor = str(p.get('vendor', '')).strip()
-            quantity = p.get('quantity', 1)
-            status = p.get('status', '예정')
-            
-            # 유효한 데이터만 포함
-            if name and name not in ['ㅇ', 'ㅇㅇ', ''] and len(name.strip()) >= 1:
-                # 특수문자 정리
-                name = name.replace(']', '').replace('[', '').strip()
-                vendor = vendor.replace(']', '').replace('[', '').strip() or '기타'
-                
-                # 상태 아이콘 추가
-                status_icon = STATUS_ICONS.get(status, '⏳')
-                
-                all_props.append({
-                    '콘텐츠': content_title,
-                    '소품명': name,
-                    '구매처': vendor,
-                    '수량': quantity,
-                    '상태': f"{status_icon} {status}"
-                })
-                
-                total_count += quantity
-                if status == '수령완료':
-                    completed_count += quantity
+    df = _props_frame([dkey])
     
-    if all_props:
+    if not df.empty:
+        total_count = int(df["수량"].sum())
+        completed_count = int(df.loc[df["상태"] == "수령완료", "수량"].sum())
+
         # 요약 통계
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -115,9 +168,11 @@ def render():
             progress = (completed_count / total_count * 100) if total_count > 0 else 0
             st.metric("완료율", f"{progress:.1f}%")
         
-        # 간단한 테이블로 모든 소품 표시
-        df = pd.DataFrame(all_props)
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        # 간단한 테이블로 모든 소품 표시 (상태 아이콘 추가)
+        df["상태"] = df["상태"].map(STATUS_ICONS).fillna("⏳") + " " + df["상태"]
+        st.dataframe(df.drop(columns=["날짜"]), use_container_width=True, hide_index=True)
         
     else:
         st.info("📌 등록된 소품이 없습니다.")
+
+    _render_shopping_list(d)
@@ -0,0 +1,75 @@
+# modules/repository.py
+"""
+탭 모듈이 읽는 저장소 API. 세션 상태의 JSON dict를 models 객체로 바꿔 날짜/콘텐츠 단위로 캐시하고,
+하이드레이트 때 비우며 변경(mutate) 때 건드린 날짜/콘텐츠만 버림 → 다음 조회 때 한 번만 다시 변환.
+쓰기는 지금처럼 storage.mutate (dict 필드)로.
+streamlit에 의존하지 않음 (indexes처럼 세션 상태나 일반 dict 모두 가능)
+"""
+from __future__ import annotations
+from typing import Dict, Any, List, Optional
+
+from . import indexes
+from .models import Content, Prop, ScheduleEntry, UploadState
+
+MODELS_KEY = "_models"
+
+
+def _cache(state) -> Dict[str, Dict[str, list]]:
+    cache = state.get(MODELS_KEY)
+    if cache is None:
+        cache = state[MODELS_KEY] = {"contents": {}, "props": {}, "schedules": {}}
+    return cache
+
+def _cached(state, kind: str, source_key: str, key: str, model):
+    bucket = _cache(state)[kind]
+    hit = bucket.get(key)
+    if hit is None:
+        hit = bucket[key] = [model.from_dict(d) for d in ((state.get(source_key) or {}).get(key) or [])]
+    return hit
+
+
+# ========== 조회 ==========
+
+def contents(state, dkey: str) -> List[Content]:
+    """그 날짜의 콘텐츠 (원본 목록과 같은 순서)"""
+    return _cached(state, "contents", "daily_contents", dkey, Content)
+
+def content(state, cid: Optional[str]) -> Optional[Content]:
+    hit = indexes.locate(state, cid)
+    return contents(state, hit[0])[hit[1]] if hit else None
+
+def props(state, cid: Optional[str]) -> List[Prop]:
+    if not cid:
+        return []
+    return _cached(state, "props", "content_props", cid, Prop)
+
+def schedules(state, dkey: str) -> List[ScheduleEntry]:
+    """그 날짜의 스케줄 (시작시간 순, 원본 목록과 같은 순서)"""
+    return _cached(state, "schedules", "schedules", dkey, ScheduleEntry)
+
+def upload_state(state, cid: Optional[str]) -> UploadState:
+    return UploadState(cid, (state.get("upload_status") or {}).get(cid or "", indexes.DEFAULT_STATUS))
+
+
+# ========== 갱신 ==========
+
+def reset(state):
+    """하이드레이트/전체 교체 때: 변환해 둔 객체를 모두 버림"""
+    state[MODELS_KEY] = {"contents": {}, "props": {}, "schedules": {}}
+
+def on_mutate(state, op: str, args: Dict[str, Any]):
+    """journal.apply 직후 호출: 바뀐 날짜/콘텐츠의 객체만 버림"""
+    if op == "replace_all":
+        reset(state)
+        return
+    cache = _cache(state)
+    if op in ("add_contents", "update_content", "delete_content"):
+        cache["contents"].pop(args.get("date"), None)
+    elif op == "move_content":
+        for dkey in (args.get("src"), args.get("dst")):
+            cache["contents"].pop(dkey, None)
+            cache["schedules"].pop(dkey, None)
+    elif op == "add_prop":
+        cache["props"].pop(args.get("cid"), None)
+    elif op in ("add_schedule", "update_schedule", "delete_schedule"):
+        cache["schedules"].pop(args.get("date"), None)
@@ -0,0 +1,183 @@
+# modules/search.py
+"""
+전체 기획안 검색: 글자 n-gram(한 단어 안의 2글자, 한 글자 단어는 그대로) 역색인.
+- 대상 필드: 제목/출연자/초안/의견/피드백/최종안/참고 링크 (제목·출연자 가중치 높음)
+- 첫 검색 때 만들고(하이드레이트 때는 버리기만), 이후 변경(mutate) 때 바뀐 콘텐츠만 다시 색인
+- 색인은 data_search.json에 콘텐츠 지문과 함께 저장 → 같은 데이터면 다시 만들지 않고 읽기만
+streamlit에 의존하지 않음 (indexes처럼 세션 상태나 일반 dict 모두 가능)
+"""
+from __future__ import annotations
+import json, math, os, re, hashlib
+from typing import Dict, Any, List
+
+from . import codec, indexes
+
+INDEX_PATH = "data_search.json"
+SEARCH_KEY = "_search_index"
+FIELD_WEIGHTS = {
+    "title": 3, "performers": 2,
+    "draft": 1, "revision": 1, "feedback": 1, "final": 1, "reference": 1,
+}
+TF_CAP = 3  # gram 하나가 점수에 기여하는 최대 가중 빈도 (질의 빈도 1당)
+SNIPPET_CHARS = 40
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _grams(text: str) -> List[str]:
+    out = []
+    for word in _WORD_RE.findall(text.lower()):
+        if len(word) == 1:
+            out.append(word)
+        else:
+            out.extend(word[i:i+2] for i in range(len(word) - 1))
+    return out
+
+def _field_text(c: Dict[str, Any], field: str) -> str:
+    v = c.get(field)
+    if isinstance(v, list):
+        return " ".join(str(x) for x in v)
+    return "" if v is None else str(v)
+
+def _doc_grams(c: Dict[str, Any]) -> Dict[str, int]:
+    """콘텐츠 하나 → {gram: 가중 빈도}"""
+    weights: Dict[str, int] = {}
+    for field, w in FIELD_WEIGHTS.items():
+        for g in _grams(_field_text(c, field)):
+            weights[g] = weights.get(g, 0) + w
+    return weights
+
+
+# ========== 색인 ==========
+# {"fp": 콘텐츠 지문, "docs": {cid: {gram: w}}, "postings": {gram: {cid: w}}}
+
+def _fingerprint(state) -> str:
+    blob = json.dumps(state.get("daily_contents") or {}, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+def _add_doc(index, cid: str, c: Dict[str, Any]):
+    grams = _doc_grams(c)
+    if not grams:
+        return
+    index["docs"][cid] = grams
+    for g, w in grams.items():
+        index["postings"].setdefault(g, {})[cid] = w
+
+def _remove_doc(index, cid: str):
+    for g in index["docs"].pop(cid, {}):
+        post = index["postings"].get(g)
+        if post is not None:
+            post.pop(cid, None)
+            if not post:
+                del index["postings"][g]
+
+def _load_saved(fp: str):
+    try:
+        with open(INDEX_PATH, "r", encoding="utf-8") as f:
+            saved = codec.loads(f.read())
+        return saved if isinstance(saved, dict) and saved.get("fp") == fp else None
+    except Exception:
+        return None
+
+def _save(index):
+    try:
+        tmp = INDEX_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(codec.encode(index))
+        os.replace(tmp, INDEX_PATH)
+    except Exception:
+        pass
+
+def reset(state):
+    """하이드레이트/전체 교체 때: 색인을 버림 (다음 검색 때 다시 준비)"""
+    state[SEARCH_KEY] = None
+
+def rebuild(state):
+    """저장된 색인의 지문이 같으면 읽고, 아니면 새로 만들어 저장"""
+    fp = _fingerprint(state)
+    index = _load_saved(fp)
+    if index is None:
+        index = {"fp": fp, "docs": {}, "postings": {}}
+        for items in (state.get("daily_contents") or {}).values():
+            for c in items or []:
+                if isinstance(c, dict) and c.get("id"):
+                    _add_doc(index, c["id"], c)
+        _save(index)
+    state[SEARCH_KEY] = index
+    return index
+
+def _index(state):
+    index = state.get(SEARCH_KEY)
+    return index if index is not None else rebuild(state)
+
+def _reindex(state, cids):
+    index = state.get(SEARCH_KEY)
+    if index is None:
+        return  # 아직 검색 전: 첫 검색 때 현재 상태로 만들어짐
+    for cid in cids:
+        _remove_doc(index, cid)
+        hit = indexes.locate(state, cid)
+        if hit:
+            _add_doc(index, cid, state["daily_contents"][hit[0]][hit[1]])
+    index["fp"] = None  # 세션에서 바뀐 색인은 저장본과 다름
+
+def on_mutate(state, op: str, args: Dict[str, Any]):
+    """journal.apply 직후 호출: 내용이 바뀐 콘텐츠만 다시 색인"""
+    if op == "replace_all":
+        reset(state)
+    elif op == "add_contents":
+        _reindex(state, [c.get("id") for c in args.get("items") or [] if c.get("id")])
+    elif op in ("update_content", "delete_content") and args.get("id"):
+        if op == "delete_content" or set(args.get("fields") or {}) & set(FIELD_WEIGHTS):
+            _reindex(state, [args["id"]])
+
+
+# ========== 검색 ==========
+
+def _snippet(c: Dict[str, Any], query: str) -> str:
+    """질의가 그대로 나오는 필드의 앞뒤 일부, 없으면 제목 외 첫 내용"""
+    q = query.strip().lower()
+    for field in FIELD_WEIGHTS:
+        text = _field_text(c, field)
+        pos = text.lower().find(q) if q else -1
+        if pos >= 0:
+            start = max(0, pos - SNIPPET_CHARS // 2)
+            return ("…" if start else "") + text[start:start + SNIPPET_CHARS].replace("\n", " ")
+    body = next((_field_text(c, f) for f in ("final", "draft") if _field_text(c, f).strip()), "")
+    return body[:SNIPPET_CHARS].replace("\n", " ")
+
+def search(state, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    질의 n-gram과 겹치는 콘텐츠를 점수순으로 반환.
+    점수 = Σ min(문서 가중 빈도, 질의 빈도 × TF_CAP) × idf, 질의 문자열이 그대로 포함되면 2배.
+    각 항목: {"cid", "date", "title", "score", "snippet"}
+    """
+    index = _index(state)
+    q_grams: Dict[str, int] = {}
+    for g in _grams(query):
+        q_grams[g] = q_grams.get(g, 0) + 1
+    if not q_grams:
+        return []
+    n_docs = max(1, len(index["docs"]))
+    scores: Dict[str, float] = {}
+    for g, qf in q_grams.items():
+        post = index["postings"].get(g)
+        if not post:
+            continue
+        idf = math.log(1 + n_docs / len(post))
+        for cid, w in post.items():
+            scores[cid] = scores.get(cid, 0.0) + min(w, qf * TF_CAP) * idf
+
+    needle = query.strip().lower()
+    ranked = []
+    for cid, score in sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:limit * 3]:
+        hit = indexes.locate(state, cid)
+        if not hit:
+            continue
+        c = state["daily_contents"][hit[0]][hit[1]]
+        if needle and any(needle in _field_text(c, f).lower() for f in FIELD_WEIGHTS):
+            score *= 2  # 질의 전체가 그대로 들어 있는 콘텐츠 우선
+        ranked.append({"cid": cid, "date": hit[0], "title": c.get("title") or "(제목 없음)",
+                       "score": round(score, 2), "snippet": _snippet(c, query)})
+    ranked.sort(key=lambda r: (-r["score"], r["date"]))
+    return ranked[:limit]
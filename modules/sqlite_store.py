@@ -0,0 +1,162 @@
+# modules/sqlite_store.py
+from __future__ import annotations
+import json, sqlite3, threading
+from .github_store import _get
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contents (
+    id       TEXT PRIMARY KEY,
+    date     TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_contents_date ON contents(date, position);
+
+CREATE TABLE IF NOT EXISTS props (
+    content_id TEXT NOT NULL,
+    position   INTEGER NOT NULL,
+    data       TEXT NOT NULL,
+    PRIMARY KEY (content_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS schedules (
+    date       TEXT NOT NULL,
+    position   INTEGER NOT NULL,
+    content_id TEXT,
+    data       TEXT NOT NULL,
+    PRIMARY KEY (date, position)
+);
+CREATE INDEX IF NOT EXISTS ix_schedules_cid ON schedules(content_id);
+
+CREATE TABLE IF NOT EXISTS upload_status (
+    content_id TEXT PRIMARY KEY,
+    status     TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# 테이블별 (기본키 컬럼, 값 컬럼)
+TABLES = {
+    "contents": (("id",), ("date", "position", "data")),
+    "props": (("content_id", "position"), ("data",)),
+    "schedules": (("date", "position"), ("content_id", "data")),
+    "upload_status": (("content_id",), ("status",)),
+}
+
+# 마지막으로 DB와 맞춘 행: path → {table: {pk: values}} — 바뀐 행만 upsert하기 위한 비교 기준
+_rows_cache: dict = {}
+_lock = threading.Lock()
+
+def _path() -> str:
+    return _get("sqlite_path", "data_store.sqlite3")
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True)
+
+def _payload_rows(payload: dict) -> dict:
+    """페이로드 → 테이블별 {pk: values}"""
+    rows = {t: {} for t in TABLES}
+    for dkey, items in (payload.get("daily_contents") or {}).items():
+        for pos, c in enumerate(items or []):
+            cid = c.get("id") or f"{dkey}#{pos}"
+            rows["contents"][(cid,)] = (dkey, pos, _dumps(c))
+    for cid, items in (payload.get("content_props") or {}).items():
+        for pos, p in enumerate(items or []):
+            rows["props"][(cid, pos)] = (_dumps(p),)
+    for dkey, items in (payload.get("schedules") or {}).items():
+        for pos, s in enumerate(items or []):
+            rows["schedules"][(dkey, pos)] = (s.get("cid"), _dumps(s))
+    for cid, status in (payload.get("upload_status") or {}).items():
+        rows["upload_status"][(cid,)] = (status,)
+    return rows
+
+def _read_rows(conn: sqlite3.Connection) -> dict:
+    rows = {}
+    for table, (pk, cols) in TABLES.items():
+        n = len(pk)
+        cur = conn.execute(f"SELECT {', '.join(pk + cols)} FROM {table}")
+        rows[table] = {tuple(r[:n]): tuple(r[n:]) for r in cur}
+    return rows
+
+def sqlite_load():
+    path = _path()
+    with _lock:
+        conn = _connect(path)
+        try:
+            rows = _read_rows(conn)
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        finally:
+            conn.close()
+        _rows_cache[path] = rows
+    if not any(rows.values()):
+        return None
+
+    daily: dict = {}
+    for (cid,), (dkey, pos, data) in sorted(rows["contents"].items(), key=lambda kv: (kv[1][0], kv[1][1])):
+        daily.setdefault(dkey, []).append(json.loads(data))
+    props: dict = {}
+    for (cid, pos), (data,) in sorted(rows["props"].items()):
+        props.setdefault(cid, []).append(json.loads(data))
+    scheds: dict = {}
+    for (dkey, pos), (_, data) in sorted(rows["schedules"].items()):
+        scheds.setdefault(dkey, []).append(json.loads(data))
+    return {
+        "daily_contents": daily,
+        "content_props": props,
+        "schedules": scheds,
+        "upload_status": {cid: status for (cid,), (status,) in rows["upload_status"].items()},
+        "_last_saved": meta.get("_last_saved"),
+    }
+
+def sqlite_save(payload: dict):
+    """직전 상태와 비교해 바뀐 행만 upsert, 사라진 행만 delete (한 트랜잭션)"""
+    path = _path()
+    new_rows = _payload_rows(payload)
+    with _lock:
+        conn = _connect(path)
+        try:
+            old_rows = _rows_cache.get(path)
+            if old_rows is None:
+                old_rows = _read_rows(conn)
+            with conn:
+                for table, (pk, cols) in TABLES.items():
+                    old, new = old_rows[table], new_rows[table]
+                    changed = [k + v for k, v in new.items() if old.get(k) != v]
+                    removed = [k for k in old if k not in new]
+                    if changed:
+                        names = pk + cols
+                        conn.executemany(
+                            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+                            f"ON CONFLICT ({', '.join(pk)}) DO UPDATE SET "
+                            + ", ".join(f"{c}=excluded.{c}" for c in cols),
+                            changed,
+                        )
+                    if removed:
+                        conn.executemany(
+                            f"DELETE FROM {table} WHERE " + " AND ".join(f"{c}=?" for c in pk),
+                            removed,
+                        )
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('_last_saved', ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value=excluded.value",
+                    (payload.get("_last_saved"),),
+                )
+        except Exception:
+            # 캐시가 DB와 어긋났을 수 있으므로 다음 저장 때 다시 읽음
+            _rows_cache.pop(path, None)
+            raise
+        finally:
+            conn.close()
+        _rows_cache[path] = new_rows
+    return True
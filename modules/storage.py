@@ -1,11 +1,15 @@
 # modules/storage.py
 from __future__ import annotations
 import streamlit as st
-import json, os
+import json, os, copy, time, threading, atexit, uuid, hashlib
 from datetime import datetime
-from . import github_store
+from . import github_store, sqlite_store, journal, codec, indexes, repository, search, widgets
 
 STORE_PATH = "data_store.json"
+CACHE_PATH = "data_cache.json"  # 마지막으로 받은/저장한 스냅샷: 콜드 스타트 때 원격을 기다리지 않고 바로 표시
+REMOTE_WAIT = 30  # 초: 첫 원격 확인을 기다리는 최대 시간 (실패해도 이후엔 저장 허용)
+SNAPSHOT_TTL = 60  # 초: 프로세스 공용 스냅샷을 원격에서 다시 읽기까지의 간격
+AUTOSAVE_QUIET = 1.5  # 초: 마지막 자동저장 요청 후 이만큼 조용하면 한 번에 업로드
 CURRENT_KEYS = ["daily_contents", "content_props", "schedules", "upload_status"]
 LEGACY_MAP = {
     "contents": "daily_contents",
@@ -26,83 +30,468 @@ def _ensure_defaults():
     st.session_state.setdefault("_autosave", True)
     st.session_state.setdefault("_last_saved", None)
     st.session_state.setdefault("_storage_source", None)
+    st.session_state.setdefault("_snapshot_version", None)
+    st.session_state.setdefault("_session_id", uuid.uuid4().hex[:8])
+
+# ===== 저장소 백엔드 =====
+# 이름 → (load() -> dict|None, save(payload) -> bool). 설정 storage_backend에 나열한 순서로 시도
+# 예) "gist,local"(기본: Gist 실패 시 로컬 JSON), "local", "sqlite", "sqlite,gist"
+
+def _local_load():
+    if not os.path.exists(STORE_PATH):
+        return None
+    with open(STORE_PATH, "r", encoding="utf-8") as f:
+        return codec.loads(f.read())
+
+def _local_save(payload: dict):
+    text = codec.encode(payload)
+    with open(STORE_PATH, "w", encoding="utf-8") as f:
+        f.write(text)
+    codec.note_written(payload, text)
+    return True
+
+BACKENDS = {
+    "gist": (github_store.gist_load, github_store.gist_save),
+    "local": (_local_load, _local_save),
+    "sqlite": (sqlite_store.sqlite_load, sqlite_store.sqlite_save),
+}
+BACKEND_LABELS = {"gist": "Gist", "local": "Local", "sqlite": "SQLite"}
+DEFAULT_BACKENDS = "gist,local"
+
+def _backend_chain() -> list[str]:
+    raw = str(github_store._get("storage_backend", DEFAULT_BACKENDS) or DEFAULT_BACKENDS)
+    names = [n.strip().lower() for n in raw.split(",") if n.strip().lower() in BACKENDS]
+    return names or DEFAULT_BACKENDS.split(",")
+
+def _normalize(data: dict) -> dict:
+    """레거시 키를 현재 키로 맞춘 새 dict (하위 객체는 공유)"""
+    out = {k: data[k] for k in CURRENT_KEYS if k in data}
+    for old, new in LEGACY_MAP.items():
+        if old in data and not out.get(new):
+            out[new] = data[old]
+    out["_last_saved"] = data.get("_last_saved")
+    return out
 
 def _hydrate(data: dict):
     if not isinstance(data, dict):
         return
+    data = _normalize(data)
+    # 레거시 스케줄에도 id: 위젯 키와 저널 명령이 위치가 아닌 id로 항목을 가리키도록
+    journal.ensure_schedule_ids(data)
     for k in CURRENT_KEYS:
         if k in data:
             st.session_state[k] = data[k]
-    for old, new in LEGACY_MAP.items():
-        if old in data and not st.session_state.get(new):
-            st.session_state[new] = data[old]
     st.session_state["_last_saved"] = data.get("_last_saved")
+    indexes.rebuild(st.session_state)
+    repository.reset(st.session_state)
+    search.reset(st.session_state)
+    # 편집 위젯에 남은 예전 값이 수정으로 잡혀 새 데이터를 되돌리지 않도록
+    widgets.resync(st.session_state)
 
-def load_state():
-    _ensure_defaults()
+# ===== 프로세스 공용 스냅샷 (모든 세션/리런이 공유) =====
+_snapshot_lock = threading.Lock()
+# state: empty | cached(로컬 캐시로 띄움, 원격 확인 전) | fresh | revalidated(캐시를 원격 데이터로 교체함)
+# fp: data 내용의 지문(_serialize) — 원격에서 다시 읽은 내용이 같으면 버전을 올리지 않음
+_snapshot = {"data": None, "fp": None, "source": None, "version": 0, "loaded_at": 0.0,
+             "errors": [], "origin": None, "replayed": False, "state": "empty", "refreshing": False}
+# 첫 원격 확인이 끝나기 전에는 업로드하지 않음 (캐시 기반 데이터로 원격을 덮어쓰지 않도록)
+_remote_ready = threading.Event()
+# 진행 중인 원격 읽기(refreshing)가 끝나면 set. 결과가 필요한 호출은 락 대신 이것을 기다림
+_fetch_done = threading.Event()
+_fetch_done.set()
+
+def _fetch_remote():
+    """설정된 백엔드 순서대로 읽어 (data, source, errors) 반환. st 호출 없음."""
+    errors = []
+    for name in _backend_chain():
+        load, _ = BACKENDS[name]
+        try:
+            data = load()
+            if data:
+                return data, name, errors
+        except Exception as e:
+            errors.append(f"{BACKEND_LABELS[name]} 로드 실패: {e}")
+    return None, None, errors
+
+def _read_cache():
+    """콜드 스타트용 로컬 스냅샷 캐시 (없거나 깨졌으면 None)"""
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            return codec.loads(f.read())
+    except Exception:
+        return None
 
-    # A. Gist
+def _write_cache(data: dict):
     try:
-        if hasattr(github_store, "gist_load"):
-            g = github_store.gist_load()
-            if g:
-                _hydrate(g)
-                st.session_state["_storage_source"] = "gist"
-                return
+        tmp = CACHE_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(codec.encode(data))
+        os.replace(tmp, CACHE_PATH)
+    except Exception:
+        pass
+
+def _apply_fetch(raw, source, errors):
+    """(_snapshot_lock 안에서) 원격에서 읽은 결과를 스냅샷에 반영"""
+    _snapshot["errors"] = errors
+    _snapshot["loaded_at"] = time.monotonic()
+    # 모든 백엔드가 실패한 경우엔 저널 재적용을 미룸: 빈 데이터 위에 재적용하면 그 결과가
+    # 스냅샷/저장 대상이 되어 원격의 실제 데이터를 덮어씀 → 지금 데이터(캐시) 유지, 다음 성공 때 재적용
+    failed = raw is None and bool(errors)
+    first = not _snapshot["replayed"] and not failed
+    was_cached = _snapshot["state"] == "cached"
+    data, recovered = raw, False
+    if first:
+        # 프로세스 시작 후 첫 원격 로드: 원격에 반영되지 못한 저널 항목을 원격 데이터 위에 재적용.
+        # 캐시로 먼저 띄운 세션의 편집도 저널에 있으므로 새 데이터 위에서 다시 저장 (대기 요청은 저널 범위라 그대로 유효)
+        _snapshot["replayed"] = True
+        if journal.entries():
+            data = _normalize(copy.deepcopy(raw or {}))
+            recovered = journal.replay(data) > 0
+            source = source or "journal"
+    # 객체가 아닌 내용으로 비교: 저장 직후 다시 읽은 원격(새 객체)이 방금 저장한 것과 같으면 그대로
+    raw_fp = _serialize(raw)[1] if raw is not None else None
+    fp = _serialize(data)[1] if recovered else raw_fp
+    changed = data is not None and fp != _snapshot["fp"]
+    if changed:
+        _snapshot.update(data=data, fp=fp, source=source, version=_snapshot["version"] + 1, origin=None)
+        if raw is not None:
+            _write_cache(_normalize(raw))
+    elif data is not None:
+        _snapshot["source"] = source  # 캐시와 원격 내용이 같음 → 세션을 다시 채울 필요 없음
+    if raw is not None and not _writer.busy():
+        _writer.mark_persisted(raw_fp)
+    if recovered:
+        _writer.submit(None, journal.last_seq())
+    _snapshot["state"] = "revalidated" if (was_cached and changed) else "fresh"
+    _remote_ready.set()
+
+def _revalidate():
+    """원격을 다시 읽어 스냅샷 교체 (읽기는 락 밖, 반영만 락 안). refreshing=True로 시작한 쪽이 호출"""
+    try:
+        raw, source, errors = _fetch_remote()
     except Exception as e:
-        st.sidebar.warning(f"Gist 로드 실패: {e}")
+        raw, source, errors = None, None, [f"원격 확인 실패: {e}"]
+    try:
+        with _snapshot_lock:
+            _apply_fetch(raw, source, errors)
+    finally:
+        with _snapshot_lock:
+            _snapshot["refreshing"] = False
+        _fetch_done.set()
 
-    # B. Local
-    if os.path.exists(STORE_PATH):
-        try:
-            with open(STORE_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            _hydrate(data)
-            st.session_state["_storage_source"] = "local"
-            return
-        except Exception as e:
-            st.sidebar.warning(f"Local 로드 실패: {e}")
-
-def _collect_payload() -> dict:
-    return {
-        "daily_contents": st.session_state.get("daily_contents", {}),
-        "content_props": st.session_state.get("content_props", {}),
-        "schedules": st.session_state.get("schedules", {}),
-        "upload_status": st.session_state.get("upload_status", {}),
-        "_last_saved": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-    }
-
-def save_state():
+def _get_snapshot(force: bool = False) -> dict:
+    """
+    TTL 안이면 캐시된 스냅샷 그대로.
+    오래됐으면 stale-while-revalidate: 지금 스냅샷(또는 로컬 캐시 파일)을 바로 돌려주고 백그라운드에서 원격 확인.
+    보여줄 것이 전혀 없거나 force면 원격 읽기가 끝날 때까지 기다림.
+    원격 읽기는 락 밖에서 한 번만 (다른 호출은 _fetch_done을 기다림) → 느린 Gist가 모든 세션을 막지 않음
+    """
+    fetch_now = wait = False
+    with _snapshot_lock:
+        if not force and not _snapshot["loaded_at"] and _snapshot["data"] is None:
+            cached = _read_cache()
+            if cached is not None:
+                # 콜드 스타트: 캐시로 즉시 렌더 (편집 내용 확인용으로 저널도 적용, 업로드는 원격 확인 후)
+                data = _normalize(copy.deepcopy(cached))
+                journal.replay(data)
+                _snapshot.update(data=data, fp=_serialize(data)[1], source="cache", state="cached",
+                                 version=_snapshot["version"] + 1, origin=None)
+        age = time.monotonic() - _snapshot["loaded_at"]
+        stale = not _snapshot["loaded_at"] or age >= SNAPSHOT_TTL
+        # 업로드 대기/진행 중이면 원격이 더 오래된 것이므로 다시 읽지 않음
+        if force or (stale and not _writer.busy()):
+            need = force or _snapshot["data"] is None
+            if _snapshot["refreshing"]:
+                wait = need
+            else:
+                _snapshot["refreshing"] = True
+                _fetch_done.clear()
+                if need:
+                    fetch_now = True
+                else:
+                    threading.Thread(target=_revalidate, name="snapshot-revalidate", daemon=True).start()
+        if not (fetch_now or wait):
+            return dict(_snapshot)
+    if fetch_now:
+        _revalidate()
+    else:
+        _fetch_done.wait(REMOTE_WAIT)
+    with _snapshot_lock:
+        return dict(_snapshot)
+
+def _remember_saved(payload: dict, fp: str, source: str, origin: str | None) -> int:
+    """저장 성공한 페이로드를 공용 스냅샷으로 반영 (다른 세션이 재요청 없이 사용)"""
+    with _snapshot_lock:
+        _snapshot.update(
+            data=payload, fp=fp, source=source, origin=origin, state="fresh",
+            version=_snapshot["version"] + 1, loaded_at=time.monotonic(),
+        )
+        _write_cache(payload)
+        return _snapshot["version"]
+
+def _source_label(snap: dict) -> str | None:
+    if snap["state"] == "cached":
+        return "로컬 캐시 (원격 확인 중…)"
+    if snap["state"] == "revalidated":
+        return f"{snap['source']} (갱신됨)"
+    return snap["source"]
+
+def _hydrate_from_snapshot(snap: dict):
+    for msg in snap["errors"]:
+        st.sidebar.warning(msg)
+    if snap["data"] is not None:
+        data = _normalize(copy.deepcopy(snap["data"]))
+        # 다른 세션의 저장으로 다시 채워도 아직 저장되지 않은 이 세션의 편집(저널)은 유지
+        journal.replay(data, {st.session_state["_session_id"]: journal.last_seq()})
+        _hydrate(data)
+    st.session_state["_storage_source"] = _source_label(snap)
+    st.session_state["_snapshot_version"] = snap["version"]
+
+def load_state():
+    """세션 상태를 공용 스냅샷에서 채움. 스냅샷이 바뀐 경우에만 다시 복사."""
     _ensure_defaults()
-    payload = _collect_payload()
+    snap = _get_snapshot()
+    if st.session_state.get("_snapshot_version") == snap["version"]:
+        if snap["state"] != "cached" and st.session_state.get("_storage_source") == _source_label({**snap, "state": "cached"}):
+            st.session_state["_storage_source"] = _source_label(snap)  # 캐시와 원격이 같았던 경우
+        return
+    # 이 세션이 직접 저장한 스냅샷이면 세션 쪽이 더 최신이므로 버전만 맞춤
+    if snap["origin"] == st.session_state["_session_id"]:
+        st.session_state["_snapshot_version"] = snap["version"]
+        return
+    _hydrate_from_snapshot(snap)
+
+def snapshot_changed() -> bool:
+    """백그라운드 확인으로 이 세션이 아직 반영하지 않은 새 스냅샷이 생겼는지 (원격 호출 없음)"""
+    with _snapshot_lock:
+        if _snapshot["origin"] == st.session_state.get("_session_id"):
+            return False
+        return st.session_state.get("_snapshot_version") != _snapshot["version"]
+
+def refresh_from_remote():
+    """TTL 무시하고 원격에서 다시 읽어 세션에 적용"""
+    _ensure_defaults()
+    _hydrate_from_snapshot(_get_snapshot(force=True))
+
+def _serialize(data) -> tuple[str, str]:
+    """
+    데이터 4종을 키 정렬 JSON으로 직렬화해 (blob, fingerprint) 반환.
+    _last_saved는 빠지므로 내용이 같으면 지문도 같음.
+    """
+    blob = json.dumps(
+        {k: data.get(k, {}) for k in CURRENT_KEYS},
+        ensure_ascii=False, sort_keys=True, separators=(",", ":"),
+    )
+    return blob, hashlib.sha1(blob.encode("utf-8")).hexdigest()
 
-    ok = False
-    if st.session_state.get("_storage_source") == "gist" and hasattr(github_store, "gist_save"):
+def _collect_payload(blob: str) -> dict:
+    payload = json.loads(blob)
+    payload["_last_saved"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return payload
+
+def _persist(payload: dict):
+    """설정된 백엔드 순서대로 저장해 (ok, source, errors) 반환. st 호출 없음(백그라운드 스레드용)"""
+    errors = []
+    for name in _backend_chain():
+        _, save = BACKENDS[name]
         try:
-            ok = github_store.gist_save(payload)
+            if save(payload):
+                return True, name, errors
         except Exception as e:
-            st.sidebar.error(f"Gist 저장 실패: {e}")
+            errors.append(f"{BACKEND_LABELS[name]} 저장 실패: {e}")
+    return False, None, errors
 
-    if not ok and hasattr(github_store, "gist_save"):
-        try:
-            if github_store.gist_save(payload):
-                ok = True
-                st.session_state["_storage_source"] = "gist"
-        except Exception:
-            pass
+def _build_payload(marks: dict):
+    """
+    (writer의 _io_lock 안에서) 최신 공용 스냅샷 위에 대기 중인 세션들의 저널 항목(marks 범위)을 다시 적용.
+    세션 데이터를 그대로 올리면 그 세션이 모르는 다른 세션의 편집을 덮어쓰므로, 저장 내용은 항상 스냅샷 + 저널
+    """
+    with _snapshot_lock:
+        data = _normalize(copy.deepcopy(_snapshot["data"] or {}))
+    journal.replay(data, marks)
+    return _serialize(data)
+
+class _AutosaveWriter:
+    """
+    자동저장 요청을 모아 조용한 구간(AUTOSAVE_QUIET)이 지나면 한 번 업로드.
+    요청(submit)은 "이 세션의 저널 순번까지 저장해 달라"만 세션별로 남기고 바로 반환.
+    writer가 최신 스냅샷 + 요청한 세션들의 저널 항목으로 페이로드를 만들어 저장 → 여러 세션이 동시에 고쳐도 모두 반영.
+    프로세스당 하나의 데몬 스레드가 처리하고, 종료 시(atexit) 남은 요청을 flush.
+    """
+
+    def __init__(self, quiet: float):
+        self.quiet = quiet
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._thread = None
+        self._pending = {}  # {origin: 저널 순번} — origin None: 모든 세션(복구분)
+        self._retry = {}  # 저장 실패한 범위: 다음 요청과 함께 다시 (혼자서는 재시도하지 않음)
+        self._due = 0.0
+        self._persisted_fp = None  # 마지막으로 원격에 반영된(또는 읽어 온) 내용의 지문
+        self._saving = 0
+        self.state = "idle"  # idle | pending | saving | saved | error
+        self.last_saved = None
+        self.source = None
+        self.errors = []
+        self.last_write = None  # codec.stats(): 마지막 저장에서 실제로 보낸 바이트/절감량
+
+    def submit(self, origin: str | None, journal_seq: int):
+        """저장 요청 (바로 반환). 이미 반영된 내용과 같으면 writer가 업로드 없이 저널만 정리"""
+        with self._cond:
+            self._mark(origin, journal_seq)
+            self._due = time.monotonic() + self.quiet
+            self.state = "pending"
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="autosave-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _mark(self, origin: str | None, journal_seq: int):
+        self._pending[origin] = max(journal_seq, self._pending.get(origin, 0))
 
-    if not ok:
+    def _take(self) -> dict:
+        """(_cond 안에서) 대기 중 요청 + 실패했던 범위를 꺼냄"""
+        marks = dict(self._retry)
+        for o, sq in self._pending.items():
+            marks[o] = max(sq, marks.get(o, 0))
+        self._pending, self._retry = {}, {}
+        return marks
+
+    def mark_persisted(self, fp: str):
+        with self._cond:
+            self._persisted_fp = fp
+
+    def busy(self) -> bool:
+        with self._cond:
+            return bool(self._pending) or self._saving > 0
+
+    def status(self) -> dict:
+        with self._cond:
+            return {"state": self.state, "last_saved": self.last_saved,
+                    "source": self.source, "errors": list(self.errors), "write": self.last_write}
+
+    def flush(self, origin: str | None = None, journal_seq: int = 0):
+        """대기 중인 요청(과 주어진 세션의 저널 순번까지)을 지금 바로 저장"""
+        _remote_ready.wait(REMOTE_WAIT)
+        with self._cond:
+            if origin is not None:
+                self._mark(origin, journal_seq)  # 수동 저장: 이 세션 편집이 없어도 한 번 확인
+            if not self._pending and not self._retry:
+                return None
+            marks = self._take()
+            self._saving += 1
+            self.state = "saving"
+        return self._write_job(marks)
+
+    def _run(self):
+        while True:
+            _remote_ready.wait(REMOTE_WAIT)
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # 대기 중 새 요청이 오면 마감이 뒤로 밀림
+                while self._pending and time.monotonic() < self._due:
+                    self._cond.wait(timeout=self._due - time.monotonic())
+                if not self._pending:
+                    continue
+                marks = self._take()
+                self._saving += 1
+                self.state = "saving"
+            self._write_job(marks)
+
+    def _write_job(self, marks: dict):
+        # 예외가 나도 _saving을 되돌리고 상태를 error로 (writer 스레드가 죽지 않도록)
         try:
-            with open(STORE_PATH, "w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
-            ok = True
-            st.session_state["_storage_source"] = "local"
+            ok, source, errors, payload = self._write(marks)
         except Exception as e:
-            st.sidebar.error(f"Local 저장 실패: {e}")
+            ok, source, errors, payload = False, None, [f"자동 저장 실패: {e}"], None
+        if not ok:
+            # 저장 못 한 범위는 다음 요청과 함께 다시 (저널은 그대로 남아 있음)
+            with self._cond:
+                for o, sq in marks.items():
+                    self._retry[o] = max(sq, self._retry.get(o, 0))
+        return self._finish(ok, source, errors, payload)
+
+    def _write(self, marks: dict):
+        payload = None
+        # 페이로드를 만들고 쓰는 동안 다른 쓰기가 끼지 않도록: 나중 쓰기는 앞 쓰기가 반영된 스냅샷 위에서 만들어짐
+        with self._io_lock:
+            blob, fp = _build_payload(marks)
+            if fp == self._persisted_fp:
+                ok, source, errors = True, self.source, []  # 내용이 같음
+            else:
+                payload = _collect_payload(blob)
+                codec.reset_stats()
+                ok, source, errors = _persist(payload)
+                if ok:
+                    self.last_write = codec.stats()
+                    self._persisted_fp = fp
+                    # 세션 하나의 편집뿐이면 그 세션은 다시 채울 필요 없음
+                    origin = next(iter(marks)) if len(marks) == 1 else None
+                    _remember_saved(payload, fp, source, origin)
+            if ok:
+                # 페이로드에 들어간 범위의 저널만 잘라냄
+                for o, sq in marks.items():
+                    journal.compact(o, sq)
+        return ok, source, errors, payload
 
-    if ok:
-        st.session_state["_last_saved"] = payload["_last_saved"]
+    def _finish(self, ok: bool, source, errors: list, payload: dict | None):
+        with self._cond:
+            self._saving -= 1
+            self.errors = errors
+            if ok and payload is not None:
+                self.last_saved = payload["_last_saved"]
+                self.source = source
+            if self._pending:
+                self.state = "pending"
+            elif not self._saving:
+                self.state = "saved" if ok else "error"
+        return ok, source, errors, self.last_saved
+_writer = _AutosaveWriter(AUTOSAVE_QUIET)
+atexit.register(_writer.flush)
+
+def save_state() -> bool:
+    """즉시 저장(수동 저장). 대기 중인 다른 세션의 자동저장 요청도 이 저장에 함께 들어감."""
+    _ensure_defaults()
+    if not _remote_ready.is_set():
+        # 원격 확인 전: 캐시 기반 내용으로 덮어쓰지 않도록 확인 후 저장되게 맡김
+        _writer.submit(st.session_state["_session_id"], journal.last_seq())
+        st.sidebar.info("원격 데이터 확인 중 — 확인이 끝나면 저장됩니다.")
+        return False
+    ok, source, errors, when = _writer.flush(st.session_state["_session_id"], journal.last_seq())
+    for msg in errors:
+        st.sidebar.error(msg)
+    if ok and source:
+        st.session_state["_storage_source"] = source
+        st.session_state["_last_saved"] = when
+    return ok
 
 def autosave_maybe():
+    """
+    자동저장 켜짐이면 백그라운드 writer에 이 세션의 저널 순번을 맡기고 바로 반환 — 페이로드는 writer가 만듦.
+    마지막으로 저장된 내용과 지문이 같으면 업로드하지 않음.
+    """
+    _ensure_defaults()
     if st.session_state.get("_autosave", True):
-        save_state()
+        _writer.submit(st.session_state["_session_id"], journal.last_seq())
+
+def autosave_status() -> dict:
+    """사이드바 표시용 자동저장 상태 (idle/pending/saving/saved/error)"""
+    return _writer.status()
+
+def mutate(op: str, **args):
+    """
+    데이터 변경 단일 진입점: 저널에 기록(fsync) → 세션 상태에 적용 → 인덱스 갱신 → 자동저장 요청.
+    op/args는 journal.OPS 참고 (예: mutate("set_status", statuses={cid: "촬영완료"}))
+    """
+    _ensure_defaults()
+    args = indexes.with_position(st.session_state, op, args)
+    journal.append(op, args, origin=st.session_state["_session_id"])
+    journal.apply(st.session_state, op, args)
+    indexes.on_mutate(st.session_state, op, args)
+    repository.on_mutate(st.session_state, op, args)
+    search.on_mutate(st.session_state, op, args)
+    if op == "replace_all":
+        # 가져온 데이터로 통째로 바뀜 → 편집 위젯의 예전 값이 다음 리런에 되돌리지 않도록
+        widgets.resync(st.session_state)
+    autosave_maybe()
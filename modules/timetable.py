@@ -1,11 +1,13 @@
 # modules/timetable.py
 from __future__ import annotations
 import streamlit as st
-from datetime import datetime, date, time
+from datetime import date, time
 from typing import List, Dict, Any, Optional
+import uuid
 
-from modules import storage
-from .ui import date_picker_with_toggle, nearest_anchor_date_today, to_datestr
+from modules import storage, indexes, repository, preview, widgets
+from .models import Content
+from .ui import date_picker_with_toggle, nearest_anchor_date_today, to_datestr, edit_session_on, page_window
 
 # ========== 내부 유틸 ==========
 
@@ -14,71 +16,90 @@ def _ensure_state():
     st.session_state.setdefault("schedules", {})
 
 def _collect_days_for_nav() -> List[date]:
-    """컨텐츠/스케줄 중 하나라도 있는 날짜만 정렬"""
-    days = set()
-    for k, v in (st.session_state.get("daily_contents") or {}).items():
-        if v:
-            try: days.add(datetime.strptime(k, "%Y-%m-%d").date())
-            except: pass
-    for k, v in (st.session_state.get("schedules") or {}).items():
-        if v:
-            try: days.add(datetime.strptime(k, "%Y-%m-%d").date())
-            except: pass
-    return sorted(days)
-
-def _final_or_draft_preview(content: Dict[str, Any], max_lines: int = 3) -> str:
+    """컨텐츠/스케줄 중 하나라도 있는 날짜(정렬) — 공용 날짜 인덱스 사용"""
+    return indexes.dates(st.session_state, "any")
+
+PREVIEW_LINES = 3
+TYPE_OPTIONS = widgets.TYPE_OPTIONS
+SYNC_KEY = widgets.SYNC_KEY
+
+def _preview(c: Content) -> str:
     """기획안 요약: 최종안 or (초안) + 3줄 제한"""
-    def _preview(s: str) -> str:
-        if not s: return ""
-        lines = [ln.rstrip() for ln in str(s).splitlines()]
-        return "\n".join(lines[:max_lines])
-    final = (content.get("final") or "").strip()
-    if final:
-        return _preview(final)
-    draft = (content.get("draft") or "").strip()
-    if draft:
-        return "(초안) " + _preview(draft)
-    return ""
+    return preview.final_or_draft(c, PREVIEW_LINES, compact=False)
 
 def _sync_schedule_details_from_planning(dkey: str) -> bool:
     """
     스케줄(details)을 기획안 내용으로 동기화.
-    cid가 있는 항목만 대상. 변경이 있으면 저장 필요 True.
+    cid가 있는 항목만 대상. 원문(최종안/초안)과 details가 지난번 동기화 때와 같으면 건너뜀.
+    변경이 있으면 저널 명령으로 기록하고 True.
     """
     changed = False
+    synced = st.session_state.setdefault(SYNC_KEY, {})
     day_sched = st.session_state.get("schedules", {}).get(dkey, []) or []
-    contents = st.session_state.get("daily_contents", {}).get(dkey, []) or []
-    by_id = {c.get("id"): c for c in contents}
-    for s in day_sched:
-        cid = s.get("cid")
-        if cid and cid in by_id:
-            want = _final_or_draft_preview(by_id[cid])
-            if (s.get("details") or "") != want:
-                s["details"] = want
-                if by_id[cid].get("title"):
-                    s["title"] = by_id[cid]["title"]
+    for i, s in enumerate(list(day_sched)):
+        hit = indexes.locate(st.session_state, s.get("cid"))
+        if hit and hit[0] == dkey:
+            c = repository.contents(st.session_state, dkey)[hit[1]]
+            sid = s.get("id") or s.get("cid")
+            src, details = preview.source_key(c), s.get("details") or ""
+            if synced.get(sid) == (src, details):
+                continue  # 미리보기 그대로
+            want = _preview(c)
+            if details != want:
+                fields = {"details": want}
+                if c.title:
+                    fields["title"] = c.title
+                storage.mutate("update_schedule", date=dkey, index=i, before=dict(s), fields=fields)
                 changed = True
+            synced[sid] = (src, want)
     return changed
 
-def _sort_schedules_inplace(dkey: str):
-    """시작시간 오름차순 정렬"""
-    def _to_minutes(t: str) -> int:
-        try:
-            hh, mm = t.split(":")
-            return int(hh)*60 + int(mm)
-        except:
-            return 0
-    st.session_state["schedules"][dkey].sort(key=lambda r: _to_minutes(r.get("start","00:00")))
-
 def _time_to_str(t: time) -> str:
     return f"{t.hour:02d}:{t.minute:02d}"
 
-def _parse_time(s: str) -> time:
-    try:
-        hh, mm = [int(x) for x in s.split(":")]
-        return time(hh, mm)
-    except:
-        return time(0,0)
+# ========== 버튼 콜백 ==========
+# 콜백은 스크립트 본문보다 먼저 실행됨 → 변경이 바로 이번 렌더에 반영 (mutate 후 st.rerun으로 두 번 그리지 않음)
+
+def _nav(sel: date, step: int):
+    """이전/다음: 콘텐츠 or 스케줄 있는 날로 날짜 선택기 이동"""
+    move = indexes.prev_date if step < 0 else indexes.next_date
+    st.session_state["tt_selected"] = move(st.session_state, sel, "any") or sel
+
+def _add_options(contents: List[Content]) -> List[str]:
+    return [f"#{i+1}. {c.title or '제목없음'}" for i, c in enumerate(contents)]
+
+def _add_schedule(dkey: str):
+    ss = st.session_state
+    cid: Optional[str] = None
+    title: str = ""
+    details: str = ""
+
+    if ss.get("tt_add_mode") == "직접 입력":
+        title = ss.get("tt_add_title_direct", "")
+        details = ss.get("tt_add_details_direct", "")
+    else:
+        contents = repository.contents(ss, dkey)
+        options = _add_options(contents)
+        idx = ss.get("tt_add_select")
+        if options and idx in options:
+            c = contents[options.index(idx)]
+            cid = c.id
+            title = c.title
+            details = _preview(c)
+        disp_title = ss.get("tt_add_title_from_content", "")
+        if disp_title.strip():
+            title = disp_title.strip()
+
+    storage.mutate("add_schedule", date=dkey, entry={
+        "id": str(uuid.uuid4())[:8],
+        "start": _time_to_str(ss.get("tt_add_start") or time(12, 40)),
+        "end": _time_to_str(ss.get("tt_add_end") or time(13, 30)),
+        "type": ss.get("tt_add_type") or TYPE_OPTIONS[0],
+        "title": title or "(제목없음)",
+        "cid": cid,
+        "details": details,
+    })
+    st.toast("일정이 추가되었습니다.")
 
 # ========== 메인 렌더 ==========
 
@@ -96,19 +117,12 @@ def render():
     with c2:
         pass
     with c1:
-        if st.button("◀ 이전", use_container_width=True, disabled=not days):
-            prev = [d for d in days if d < sel]
-            st.session_state["tt_nav"] = prev[-1] if prev else (days[0] if days else sel)
-            st.rerun()
+        st.button("◀ 이전", use_container_width=True, disabled=not days, on_click=_nav, args=(sel, -1))
     with c3:
-        if st.button("다음 ▶", use_container_width=True, disabled=not days):
-            nxt = [d for d in days if d > sel]
-            st.session_state["tt_nav"] = nxt[0] if nxt else (days[-1] if days else sel)
-            st.rerun()
+        st.button("다음 ▶", use_container_width=True, disabled=not days, on_click=_nav, args=(sel, 1))
 
-    # 동기화: content 변경 시 details 업데이트
-    if _sync_schedule_details_from_planning(dkey):
-        storage.autosave_maybe()
+    # 동기화: content 변경 시 details 업데이트 (변경 시 저장은 mutate가 요청)
+    _sync_schedule_details_from_planning(dkey)
 
     st.markdown("")
 
@@ -119,106 +133,46 @@ def render():
         # 공통: 시간/유형
         t1, t2 = st.columns(2)
         with t1:
-            start_t = st.time_input("시작", value=_parse_time("12:40"), key="tt_add_start")
+            st.time_input("시작", value=time(12, 40), key="tt_add_start")
         with t2:
-            end_t   = st.time_input("종료", value=_parse_time("13:30"), key="tt_add_end")
-
-        type_options = ["촬영", "회의", "이동", "기타"]
-        typ = st.selectbox("유형", type_options, index=0, key="tt_add_type")
+            st.time_input("종료", value=time(13, 30), key="tt_add_end")
 
-        cid: Optional[str] = None
-        title: str = ""
-        details: str = ""
+        st.selectbox("유형", TYPE_OPTIONS, index=0, key="tt_add_type")
 
         if mode == "콘텐츠에서 선택":
-            contents = st.session_state.get("daily_contents", {}).get(dkey, []) or []
-            options = [f"#{i+1}. {c.get('title','제목없음')}" for i, c in enumerate(contents)]
+            contents = repository.contents(st.session_state, dkey)
+            options = _add_options(contents)
             idx = st.selectbox("콘텐츠", options=options if options else ["(없음)"], index=0 if options else None, key="tt_add_select")
-            if options:
-                c = contents[options.index(idx)]
-                cid = c.get("id")
-                title = c.get("title","")
-                details = _final_or_draft_preview(c)
-            disp_title = st.text_input("표시 제목(비우면 콘텐츠 제목 사용)", value=title, key="tt_add_title_from_content")
-            if disp_title.strip():
-                title = disp_title.strip()
+            title = contents[options.index(idx)].title if options and idx in options else ""
+            st.text_input("표시 제목(비우면 콘텐츠 제목 사용)", value=title, key="tt_add_title_from_content")
         else:
-            title = st.text_input("표시 제목(직접 입력)", key="tt_add_title_direct")
-            details = st.text_area("세부 내용(선택)", key="tt_add_details_direct")
-
-        if st.button("추가", type="primary", key="tt_add_btn"):
-            st.session_state["schedules"].setdefault(dkey, [])
-            st.session_state["schedules"][dkey].append({
-                "start": _time_to_str(start_t),
-                "end": _time_to_str(end_t),
-                "type": typ,
-                "title": title or "(제목없음)",
-                "cid": cid,
-                "details": details,
-            })
-            _sort_schedules_inplace(dkey)
-            storage.autosave_maybe()
-            st.success("일정이 추가되었습니다.")
-            st.rerun()
+            st.text_input("표시 제목(직접 입력)", key="tt_add_title_direct")
+            st.text_area("세부 내용(선택)", key="tt_add_details_direct")
+
+        st.button("추가", type="primary", key="tt_add_btn", on_click=_add_schedule, args=(dkey,))
 
     st.markdown("---")
 
     # ====== 일정 목록(수정 가능) ======
-    schedules: List[Dict[str, Any]] = st.session_state.get("schedules", {}).get(dkey, []) or []
+    schedules = repository.schedules(st.session_state, dkey)
     if not schedules:
         st.info("이 날짜의 일정이 없습니다.")
         return
 
     st.caption("🔁 항목을 수정하면 즉시 저장되고, 시간 수정 시 자동으로 순서가 재정렬됩니다.")
-    type_options = ["촬영", "회의", "이동", "기타"]
-
-    for i, s in enumerate(list(schedules)):  # copy for safe iteration
-        with st.expander(f"{s.get('start','--:--')}~{s.get('end','--:--')} · {s.get('title','(제목없음)')}", expanded=False):
-            r1c1, r1c2, r1c3, r1c4 = st.columns([1,1,1.2,0.6])
-            with r1c1:
-                new_start = st.time_input("시작", value=_parse_time(s.get("start","00:00")), key=f"tt_start_{i}")
-            with r1c2:
-                new_end = st.time_input("종료", value=_parse_time(s.get("end","00:00")), key=f"tt_end_{i}")
-            with r1c3:
-                cur_type = s.get("type", "촬영")
-                try:
-                    idx_type = type_options.index(cur_type)
-                except ValueError:
-                    idx_type = 0  # 옵션에 없으면 기본 '촬영'
-                new_type = st.selectbox("유형", type_options, index=idx_type, key=f"tt_type_{i}")
-            with r1c4:
-                # 삭제
-                st.write("")
-                if st.button("🗑️ 삭제", key=f"tt_del_{i}"):
-                    st.session_state["schedules"][dkey].pop(i)
-                    storage.autosave_maybe()
-                    st.rerun()
-
-            # 제목 / 세부
-            t1, t2 = st.columns([1.2, 2.0])
-            with t1:
-                new_title = st.text_input("표시 제목", value=s.get("title",""), key=f"tt_title_{i}")
-            with t2:
-                link_info = " (기획안 연동)" if s.get("cid") else ""
-                new_details = st.text_area(f"세부{link_info}", value=s.get("details",""), height=110, key=f"tt_details_{i}")
-
-            # 변경 감지 → 저장 및 정렬
-            changed = (
-                _time_to_str(new_start) != s.get("start") or
-                _time_to_str(new_end)   != s.get("end") or
-                new_type                != s.get("type") or
-                new_title               != s.get("title") or
-                new_details             != s.get("details")
-            )
-            if changed:
-                s["start"]   = _time_to_str(new_start)
-                s["end"]     = _time_to_str(new_end)
-                s["type"]    = new_type
-                s["title"]   = new_title
-                s["details"] = new_details
-                _sort_schedules_inplace(dkey)
-                storage.autosave_maybe()
-                st.rerun()
+    conflicts = indexes.schedule_conflicts(st.session_state, dkey)
+    if conflicts:
+        st.warning(f"⚠️ 겹치는 일정 {len(conflicts)}건 — 시간 겹침 또는 출연자 중복을 확인하세요.")
+
+    start, end = page_window(len(schedules), f"tt_{dkey}")
+    for i in range(start, end):
+        s = schedules[i]
+        mark = "⚠️ " if i in conflicts else ""
+        with st.expander(f"{mark}{s.time_range} · {s.title or '(제목없음)'}", expanded=False):
+            for msg in conflicts.get(i, []):
+                st.caption(f"⚠️ {msg}")
+            _schedule_entry(dkey, i, s.id)
+            _delete_button(dkey, i, st.session_state["schedules"][dkey][i], s.id)
 
     # 하단 요약 테이블(읽기용)
     st.markdown("---")
@@ -227,3 +181,66 @@ def render():
     if "cid" in df.columns:
         df.rename(columns={"cid":"content_id"}, inplace=True)
     st.dataframe(df, use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def _schedule_entry(dkey: str, i: int, sid: Optional[str]):
+    """
+    일정 하나 (부분 리런 단위).
+    유형/제목/세부 수정은 이 항목만 다시 실행, 시간 수정(재정렬)은 전체 리런. 삭제는 _delete_button.
+    편집 세션이면 폼으로 묶어 💾 저장 때 한 번에 기록.
+    """
+    schedules = repository.schedules(st.session_state, dkey)
+    if i >= len(schedules) or schedules[i].id != sid:
+        return  # 순서가 바뀜 → 다음 전체 리런 때 다시 그림
+    s = schedules[i]
+    raw = st.session_state["schedules"][dkey][i]  # 저널 명령의 before 비교용 원본
+    # 위젯 키는 일정 id로 (레거시 항목도 로드 때 id를 받음): 재정렬돼도 위젯이 같은 일정을 따라감
+
+    editing = edit_session_on()
+    body = st.form(f"tt_form_{sid}", border=False) if editing else st.container()
+    with body:
+        r1c1, r1c2, r1c3, r1c4 = st.columns([1,1,1.2,0.6])
+        with r1c1:
+            new_start = st.time_input("시작", value=widgets.minutes_time(s.start), key=f"tt_start_{sid}")
+        with r1c2:
+            new_end = st.time_input("종료", value=widgets.minutes_time(s.end), key=f"tt_end_{sid}")
+        with r1c3:
+            try:
+                idx_type = TYPE_OPTIONS.index(s.type)
+            except ValueError:
+                idx_type = 0  # 옵션에 없으면 기본 '촬영'
+            new_type = st.selectbox("유형", TYPE_OPTIONS, index=idx_type, key=f"tt_type_{sid}")
+        with r1c4:
+            st.write("")
+            submitted = st.form_submit_button("💾 저장", type="primary") if editing else True
+
+        # 제목 / 세부
+        t1, t2 = st.columns([1.2, 2.0])
+        with t1:
+            new_title = st.text_input("표시 제목", value=s.title, key=f"tt_title_{sid}")
+        with t2:
+            link_info = " (기획안 연동)" if s.cid else ""
+            new_details = st.text_area(f"세부{link_info}", value=s.details, height=110, key=f"tt_details_{sid}")
+
+    # 변경 감지 → 바뀐 필드만 저장, 시간이 바뀌면 정렬/겹침 표시가 달라지므로 전체 리런
+    if not submitted:
+        return
+    new = {
+        "start":   _time_to_str(new_start),
+        "end":     _time_to_str(new_end),
+        "type":    new_type,
+        "title":   new_title,
+        "details": new_details,
+    }
+    old = {"start": s.start_text, "end": s.end_text, "type": s.type, "title": s.title, "details": s.details}
+    fields = {k: v for k, v in new.items() if v != old[k]}
+    if fields:
+        storage.mutate("update_schedule", date=dkey, index=i, before=dict(raw), fields=fields)
+        if "start" in fields or "end" in fields:
+            st.rerun(scope="app")
+
+def _delete_button(dkey: str, i: int, raw: Dict[str, Any], sid: str):
+    """삭제 (구조 변경이라 일정 조각 밖: 콜백으로 처리하고 전체를 한 번만 다시 그림)"""
+    st.button("🗑️ 삭제", key=f"tt_del_{sid}", on_click=storage.mutate, args=("delete_schedule",),
+              kwargs=dict(date=dkey, index=i, before=dict(raw)))
@@ -1,8 +1,9 @@
 # modules/ui.py
 from __future__ import annotations
 import streamlit as st
-from datetime import date, datetime
-from typing import List
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Tuple
+from . import indexes
 from .ui_enhanced import (
     ThemeManager, modern_card, modern_grid,
     loading_animation, success_animation, error_animation, STATUS_STYLES
@@ -11,6 +12,10 @@ from .ui_enhanced import (
 # 기존 UI 유틸리티 유지 (하위호환성)
 DOT = {"예정":"🔴","주문완료":"🟡","수령완료":"🟢"}
 STATE_DOT = {"촬영전":"🔵","촬영완료":"🟡","편집완료":"🟠","업로드완료":"🟢"}
+CAL_GRID_DAYS = 42  # 월 달력 그리드는 항상 6주 (일요일 시작) — 앞뒤 달 날짜까지 포함
+CAL_CACHE_MAX = 12
+EDIT_SESSION_KEY = "_edit_session"
+PAGE_SIZE = 5  # 한 번에 그리는 편집 카드 수 (하루 항목이 많아도 위젯 수가 일정)
 
 def to_datestr(d: date) -> str:
     return d.strftime("%Y-%m-%d")
@@ -21,37 +26,66 @@ def parse_date(ds: str) -> date | None:
     except Exception:
         return None
 
+def edit_session_on() -> bool:
+    """편집 세션 모드: 카드/일정을 폼으로 묶어 저장 버튼을 눌렀을 때 바뀐 필드만 한 번에 기록"""
+    return bool(st.session_state.get(EDIT_SESSION_KEY, False))
+
+def _step_page(state_key: str, step: int, pages: int):
+    st.session_state[state_key] = min(max(st.session_state.get(state_key, 0) + step, 0), pages - 1)
+
+def page_window(total: int, key: str, size: int = PAGE_SIZE) -> Tuple[int, int]:
+    """
+    목록을 size개씩 나눠 현재 쪽의 [start, end) 반환 (쪽 번호는 {key}_page).
+    size개 이하면 이동 컨트롤 없이 전체.
+    """
+    if total <= size:
+        return 0, total
+    pages = (total + size - 1) // size
+    state_key = f"{key}_page"
+    page = min(st.session_state.get(state_key, 0), pages - 1)
+    st.session_state[state_key] = page
+    start, end = page * size, min(total, (page + 1) * size)
+
+    c1, c2, c3 = st.columns([1, 2, 1])
+    with c1:
+        st.button("◀ 이전", key=f"{key}_page_prev", use_container_width=True, disabled=page == 0,
+                  on_click=_step_page, args=(state_key, -1, pages))
+    with c2:
+        st.caption(f"{start+1}–{end} / {total}개 · {page+1}/{pages}쪽")
+    with c3:
+        st.button("다음 ▶", key=f"{key}_page_next", use_container_width=True, disabled=page == pages - 1,
+                  on_click=_step_page, args=(state_key, 1, pages))
+    return start, end
+
 def collect_content_dates() -> List[date]:
-    dc = st.session_state.get("daily_contents", {}) or {}
-    out=[]
-    for k,v in dc.items():
-        if v:
-            d = parse_date(k)
-            if d: out.append(d)
-    return sorted(set(out))
+    """콘텐츠가 있는 날짜(정렬). 날짜 인덱스를 그대로 돌려주므로 수정하지 말 것"""
+    return indexes.dates(st.session_state, "contents")
 
 def nearest_anchor_date_today() -> date:
-    days = collect_content_dates()
-    if not days:
-        return date.today()
-    today = date.today()
-    future = [d for d in days if d>=today]
-    return future[0] if future else days[-1]
+    return indexes.nearest_date(st.session_state, date.today()) or date.today()
 
-def _fullcalendar(selected: date, key: str) -> date:
-    # 있는 경우에만 사용, 없으면 date_input로 폴백
-    try:
-        from streamlit_calendar import calendar
-    except Exception:
-        return st.date_input("날짜", value=selected, key=f"{key}_di")
-    
-    # 콘텐츠가 있는 날짜에 마커 표시 (더 명확한 색상으로)
-    content_dates = collect_content_dates()
+def _month_window(month: date) -> Tuple[date, date]:
+    """그 달 그리드에 보이는 첫날~마지막 날(포함): 1일이나 그 앞의 일요일부터 6주"""
+    first = month.replace(day=1)
+    start = first - timedelta(days=(first.weekday() + 1) % 7)
+    return start, start + timedelta(days=CAL_GRID_DAYS - 1)
+
+def _calendar_events(start: date, end: date) -> List[Dict[str, Any]]:
+    """start~end 사이 콘텐츠 날짜의 마커 이벤트. (날짜 인덱스 버전, 구간)으로 캐시"""
+    version = indexes.date_version(st.session_state)
+    cache = st.session_state.setdefault("_cal_events", {})
+    ck = (version, to_datestr(start), to_datestr(end))
+    events = cache.get(ck)
+    if events is not None:
+        return events
+    if len(cache) >= CAL_CACHE_MAX or any(k[0] != version for k in cache):
+        cache.clear()
     events = []
-    for d in content_dates:
+    for d in indexes.dates_between(st.session_state, start, end):
+        ds = to_datestr(d)
         events.append({
-            "start": to_datestr(d),
-            "end": to_datestr(d),
+            "start": ds,
+            "end": ds,
             "display": "background",
             "color": "rgba(220, 38, 38, 0.2)",  # 더 진한 빨간색
             "borderColor": "#DC2626",
@@ -59,23 +93,55 @@ def _fullcalendar(selected: date, key: str) -> date:
         })
         # 날짜에 점 마커도 추가
         events.append({
-            "start": to_datestr(d),
-            "end": to_datestr(d),
+            "start": ds,
+            "end": ds,
             "title": "●",
             "display": "list-item",
             "color": "#DC2626",
             "textColor": "#DC2626",
             "borderColor": "#DC2626"
         })
-    
+    cache[ck] = events
+    return events
+
+def _fullcalendar(selected: date, key: str) -> date:
+    # 있는 경우에만 사용, 없으면 date_input로 폴백
+    try:
+        from streamlit_calendar import calendar
+    except Exception:
+        return st.date_input("날짜", value=selected, key=f"{key}_di")
+
+    # 보이는 달: 선택 날짜가 바뀌면 그 달로, 이전/다음 달 버튼으로 이동
+    # (달력 자체의 이동 버튼은 숨김 — 보이는 그리드 범위만 이벤트로 보내므로)
+    month_key, seen_key = f"{key}_cal_month", f"{key}_cal_seen"
+    if st.session_state.get(seen_key) != selected or month_key not in st.session_state:
+        st.session_state[month_key] = selected.replace(day=1)
+        st.session_state[seen_key] = selected
+    month = st.session_state[month_key]
+
+    m1, m2, m3 = st.columns([0.2, 0.6, 0.2])
+    with m1:
+        if st.button("◀ 이전 달", key=f"{key}_cal_prev", use_container_width=True):
+            month = (month - timedelta(days=1)).replace(day=1)
+    with m3:
+        if st.button("다음 달 ▶", key=f"{key}_cal_next", use_container_width=True):
+            month = (month + timedelta(days=32)).replace(day=1)
+    st.session_state[month_key] = month
+    with m2:
+        st.caption(month.strftime("%Y년 %m월"))
+
+    # 콘텐츠가 있는 날짜에 마커 표시 (보이는 그리드 범위만)
+    events = _calendar_events(*_month_window(month))
+
     options = {
         "locale": "ko",
+        "timeZone": "UTC",  # dateClick의 date(ISO, UTC)가 클릭한 날짜 그대로 나오도록
         "initialView": "dayGridMonth",
-        "initialDate": to_datestr(selected),
+        "firstDay": 0,  # _month_window와 같은 일요일 시작
+        "initialDate": to_datestr(month),
         "height": 520,
-        "events": events,
         "headerToolbar": {
-            "left": "prev,next today",
+            "left": "",
             "center": "title",
             "right": "dayGridMonth,listWeek"
         },
@@ -88,10 +154,12 @@ def _fullcalendar(selected: date, key: str) -> date:
         "eventBorderColor": "#DC2626",
         "eventTextColor": "#FFFFFF"
     }
-    
-    ret = calendar(options=options, key=f"{key}_cal")
+
+    # 달이 바뀌면 새로 마운트되도록 키에 달 포함 (initialDate는 처음 마운트 때만 적용됨)
+    ret = calendar(events=events, options=options, callbacks=["dateClick"],
+                   key=f"{key}_cal_{month.strftime('%Y%m')}")
     if isinstance(ret, dict) and ret.get("dateClick"):
-        ds = ret["dateClick"].get("dateStr")
+        ds = ret["dateClick"].get("dateStr") or (ret["dateClick"].get("date") or "")[:10]
         d  = parse_date(ds) if ds else None
         if d: return d
     return selected
@@ -130,14 +198,12 @@ def date_picker_with_toggle(title: str, key: str, default: date | None = None) -
     with c3:
         if st.button("◀", key=f"{key}_prev", use_container_width=True, disabled=not days):
             if days:
-                i = max(0, next((idx for idx,d in enumerate(days) if d>=selected), len(days))-1)
-                st.session_state[sel_key] = days[i-1] if i>0 else days[0]
+                st.session_state[sel_key] = indexes.prev_date(st.session_state, selected)
                 selected = st.session_state[sel_key]
     with c4:
         if st.button("▶", key=f"{key}_next", use_container_width=True, disabled=not days):
             if days:
-                i = next((idx for idx,d in enumerate(days) if d>selected), None)
-                st.session_state[sel_key] = days[i] if i is not None else days[-1]
+                st.session_state[sel_key] = indexes.next_date(st.session_state, selected)
                 selected = st.session_state[sel_key]
 
     if show:
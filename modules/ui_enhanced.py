@@ -9,6 +9,7 @@ import streamlit as st
 from datetime import date, datetime
 from typing import List, Dict, Any, Optional, Callable
 import time
+from . import indexes
 
 # 🎨 색상 테마 정의
 COLOR_THEMES = {
@@ -354,28 +355,8 @@ def simple_sidebar():
         st.caption("🎨 크롬 다크모드 설정에 따라 자동으로 테마가 변경됩니다")
 
 def _get_dashboard_stats() -> Dict[str, int]:
-    """대시보드 통계 계산"""
-    total = 0
-    completed = 0
-    in_progress = 0
-    
-    contents = st.session_state.get("daily_contents", {})
-    upload_status = st.session_state.get("upload_status", {})
-    
-    for date_key, day_contents in contents.items():
-        for content in day_contents:
-            total += 1
-            status = upload_status.get(content.get("id", ""), "촬영전")
-            if status == "업로드완료":
-                completed += 1
-            elif status in ["촬영완료", "편집완료"]:
-                in_progress += 1
-    
-    return {
-        "total": total,
-        "completed": completed,
-        "in_progress": in_progress
-    }
+    """대시보드 통계 (변경 때마다 갱신되는 집계에서 읽기만 함)"""
+    return indexes.pipeline_stats(st.session_state)
 
 def loading_animation(text: str = "처리 중..."):
     """로딩 애니메이션"""
@@ -0,0 +1,74 @@
+# modules/widgets.py
+"""
+레코드 값으로 그리는 편집 위젯(키에 콘텐츠/일정 id가 들어감)의 키 규칙과 값.
+planning/timetable/uploads의 위젯 키와 같아야 함.
+하이드레이트로 데이터가 통째로 바뀌면 세션에 남은 위젯 값이 화면의 '수정'으로 보여
+다른 세션이 저장한 내용을 되돌림 → resync로 이미 있는 위젯 키를 새 레코드 값으로 맞춤.
+(키를 지우기만 하면 브라우저가 예전 값을 다시 보내므로 값을 직접 넣어야 화면도 바뀜)
+streamlit에 의존하지 않음
+"""
+from __future__ import annotations
+from datetime import time
+from typing import Optional
+
+from . import indexes
+from .models import Content, ScheduleEntry
+
+TYPE_OPTIONS = ["촬영", "회의", "이동", "기타"]
+
+# 위젯 키 접두어 → 레코드 모델에서 위젯 값
+CONTENT_WIDGETS = {
+    "title_": lambda c: c.title,
+    "perf_": lambda c: c.performers_text,
+    "ref_": lambda c: c.reference,
+    "draft_": lambda c: c.draft,
+    "rev_": lambda c: c.revision,
+    "fb_": lambda c: c.feedback,
+    "final_": lambda c: c.final,
+}
+SCHEDULE_WIDGETS = {
+    "tt_start_": lambda s: minutes_time(s.start),
+    "tt_end_": lambda s: minutes_time(s.end),
+    "tt_type_": lambda s: s.type if s.type in TYPE_OPTIONS else TYPE_OPTIONS[0],
+    "tt_title_": lambda s: s.title,
+    "tt_details_": lambda s: s.details,
+}
+STATUS_PREFIX = "sel_"
+# timetable: {스케줄 id: (원문 키, 동기화한 details)} — 데이터가 통째로 바뀌면 버림
+SYNC_KEY = "_tt_synced"
+
+
+def minutes_time(m: int) -> time:
+    return time(min(m // 60, 23), m % 60)
+
+def content_key(dkey: str, idx: int, cid: Optional[str]) -> str:
+    """콘텐츠 위젯 키 뒷부분: id, 없으면(레거시) 날짜_위치"""
+    return cid or f"{dkey}_{idx}"
+
+def resync(state):
+    """하이드레이트/replace_all 직후: 세션에 이미 있는 레코드 위젯 키를 새 데이터 값으로 (값이 다를 때만)"""
+    state.pop(SYNC_KEY, None)
+    def put(key: str, value):
+        if key in state and state[key] != value:
+            state[key] = value
+
+    statuses = state.get("upload_status") or {}
+    for dkey, items in (state.get("daily_contents") or {}).items():
+        for idx, d in enumerate(items or []):
+            if not isinstance(d, dict):
+                continue
+            c = Content.from_dict(d)
+            wk = content_key(dkey, idx, c.id)
+            for prefix, value in CONTENT_WIDGETS.items():
+                put(prefix + wk, value(c))
+            if c.id:
+                put(STATUS_PREFIX + c.id, statuses.get(c.id, indexes.DEFAULT_STATUS))
+    for items in (state.get("schedules") or {}).values():
+        for d in items or []:
+            if not isinstance(d, dict):
+                continue
+            s = ScheduleEntry.from_dict(d)
+            if not s.id:
+                continue
+            for prefix, value in SCHEDULE_WIDGETS.items():
+                put(prefix + s.id, value(s))
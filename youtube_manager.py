@@ -1,15 +1,14 @@
 # youtube_manager.py - 유튜브 콘텐츠 매니저 (UI 개선 버전)
 import streamlit as st
 from modules import storage
-from modules import dashboard, planning, props, timetable, uploads
-import requests, json
-from modules.github_store import _get, _auth_headers
+from modules import dashboard, planning, props, timetable, uploads, performers
+from modules.ui import EDIT_SESSION_KEY
 
 # ===== 🆘 강제 가져오기(원클릭 복구) =====
 # 사이드바 어딘가에 붙이세요 (imports는 블록 안에 포함됨)
 with st.sidebar.expander("🆘 강제 가져오기 (Gist)", expanded=False):
-    import json, requests
-    from datetime import date, datetime
+    import copy
+    from datetime import date
 
     # secrets 기본값 읽기
     def _get_secret(name, default=None):
@@ -34,69 +33,31 @@ with st.sidebar.expander("🆘 강제 가져오기 (Gist)", expanded=False):
             return nearest_content_date_from_today()  # 기존 코드에 있을 때
         except Exception:
             pass
-        # Fallback 계산
-        dc = st.session_state.get("daily_contents", {}) or {}
-        days = []
-        for k, items in dc.items():
-            if not items:
-                continue
-            try:
-                days.append(datetime.strptime(k, "%Y-%m-%d").date())
-            except Exception:
-                continue
-        if not days:
-            return date.today()
-        today = date.today()
-        fut = [d for d in sorted(days) if d >= today]
-        return fut[0] if fut else sorted(days)[-1]
-
-    # (3) Gist에서 파일 읽기
+        # Fallback: 공용 날짜 인덱스(bisect)
+        from modules import indexes
+        return indexes.nearest_date(st.session_state, date.today()) or date.today()
+
+    # (3) Gist에서 파일 읽기 (월별 샤드/단일 파일 모두 github_store가 처리, 캐시 무시)
     def _fetch_gist_json(gist_id: str, token: str, filename: str):
         if not gist_id:
             raise RuntimeError("Gist ID가 비어 있습니다.")
-        headers = {"Accept": "application/vnd.github+json"}
-        if token:
-            headers["Authorization"] = f"token {token}"
-
-        meta = requests.get(f"https://api.github.com/gists/{gist_id}",
-                            headers=headers, timeout=20)
-        meta.raise_for_status()
-        files = (meta.json() or {}).get("files", {}) or {}
-
-        # 파일명 우선 고정: 입력값 → youtube_data.json → data_store.json
-        pick = None
-        for want in [filename, "youtube_data.json", "data_store.json"]:
-            for k in files.keys():
-                if k.lower() == want.lower():
-                    pick = k
-                    break
-            if pick:
-                break
-        if not pick:
+        from modules import github_store
+        data = github_store.gist_load(gist_id=gist_id, token=token, filename=filename, force=True)
+        if data is None:
             raise RuntimeError("지정한 파일을 Gist에서 찾을 수 없습니다.")
+        return copy.deepcopy(data)
 
-        info = files[pick]
-        if info.get("truncated") and info.get("raw_url"):
-            raw = requests.get(info["raw_url"], timeout=20).text
-            return json.loads(raw)
-        return json.loads(info.get("content", "") or "{}")
-
-    # (4) 세션으로 주입(레거시 키 자동 매핑)
+    # (4) 세션으로 주입(현재 키 우선, 레거시 키 자동 매핑)
+    # 저널 명령(replace_all)으로 기록 → 세션 적용 → 자동 저장 요청까지 한 번에
     def _inject_to_session(payload: dict):
-        st.session_state.setdefault("daily_contents", {})
-        st.session_state.setdefault("content_props", {})
-        st.session_state.setdefault("schedules", {})
-        st.session_state.setdefault("upload_status", {})
-
-        # 레거시 → 현재
-        if "contents" in payload:
-            st.session_state["daily_contents"] = payload["contents"]
-        if "props" in payload:
-            st.session_state["content_props"] = payload["props"]
-        if "schedules" in payload:
-            st.session_state["schedules"] = payload["schedules"]
-        if "upload_status" in payload:
-            st.session_state["upload_status"] = payload["upload_status"]
+        data = {}
+        for cur, old in [("daily_contents", "contents"), ("content_props", "props"),
+                         ("schedules", "schedules"), ("upload_status", "upload_status")]:
+            if cur in payload:
+                data[cur] = payload[cur]
+            elif old in payload:
+                data[cur] = payload[old]
+        storage.mutate("replace_all", data=data)
 
     # (5) 실행 버튼
     if st.button("🔧 Gist에서 불러와 적용", use_container_width=True):
@@ -115,13 +76,6 @@ with st.sidebar.expander("🆘 강제 가져오기 (Gist)", expanded=False):
                     if k in st.session_state:
                         st.session_state[k] = anchor
 
-                # 자동 저장(있으면 사용)
-                try:
-                    from modules import storage
-                    storage.autosave_maybe()
-                except Exception:
-                    pass
-
                 st.success("강제가져오기 → 주입 → 날짜리셋 → 저장 완료!")
                 st.rerun()
         except Exception as e:
@@ -145,25 +99,55 @@ st.set_page_config(
     }
 )
 
-# ★ 앱 시작 시: GitHub/Gist/Local에서 자동 로드
+# ★ 앱 시작 시: 프로세스 공용 스냅샷(GitHub/Gist/Local, TTL 캐시)에서 세션 채우기
 storage.load_state()
 
 # 간단한 사이드바 적용 (테마 시스템 제거)
 from modules.ui_enhanced import simple_sidebar
 simple_sidebar()
 
+# 자동저장 상태 표시 (백그라운드 writer 진행 상황을 주기적으로 갱신)
+AUTOSAVE_LABELS = {
+    "idle": "⚪ 변경 없음",
+    "pending": "⏳ 저장 대기 중",
+    "saving": "💾 저장 중…",
+    "saved": "✅ 저장됨",
+    "error": "⚠️ 저장 실패",
+}
+
+@st.fragment(run_every=2)
+def _storage_status():
+    # 백그라운드 원격 확인으로 새 데이터가 도착했으면 전체 리런으로 세션에 반영
+    if storage.snapshot_changed():
+        st.rerun(scope="app")
+    stat = storage.autosave_status()
+    if stat["state"] == "saved":
+        st.session_state["_storage_source"] = stat["source"]
+        st.session_state["_last_saved"] = stat["last_saved"]
+    st.caption(AUTOSAVE_LABELS.get(stat["state"], stat["state"]))
+    for msg in stat["errors"]:
+        st.caption(f"⚠️ {msg}")
+    src = st.session_state.get("_storage_source") or "unknown"
+    when = st.session_state.get("_last_saved") or "-"
+    st.caption(f"💾 소스: {src}")
+    st.caption(f"🕒 최종 저장: {when}")
+    w = stat.get("write")
+    if w and w["files"]:
+        pct = w["saved"] / w["pretty_bytes"] * 100 if w["pretty_bytes"] else 0
+        st.caption(f"📦 마지막 저장: {w['bytes']/1024:.1f}KB · 파일 {w['files']}개 (−{w['saved']/1024:.1f}KB, {pct:.0f}% 절감)")
+
 # 기존 저장 섹션을 사이드바에 추가
 with st.sidebar:
     st.markdown("---")
     st.markdown("### 💾 데이터 저장")
     st.toggle("자동 저장", key="_autosave", value=st.session_state.get("_autosave", True))
+    st.toggle("편집 세션 (저장 버튼으로 반영)", key=EDIT_SESSION_KEY,
+              help="켜면 기획 카드/타임테이블 일정을 입력하는 동안 저장·리런하지 않고, 💾 저장을 누를 때 바뀐 필드만 한 번에 기록합니다.")
     if st.button("수동 저장", use_container_width=True):
-        storage.save_state()
-        st.success("저장 완료")
-    src = st.session_state.get("_storage_source") or "unknown"
-    when = st.session_state.get("_last_saved") or "-"
-    st.caption(f"💾 소스: {src}")
-    st.caption(f"🕒 최종 저장: {when}")
+        if storage.save_state():
+            st.success("저장 완료")
+    st.button("원격에서 새로고침", use_container_width=True, on_click=storage.refresh_from_remote)
+    _storage_status()
 
 # 🔥 JavaScript + CSS 강력한 다크모드 감지 및 강제 적용 🔥
 st.markdown("""
@@ -353,18 +337,16 @@ button[aria-label*="calendar"],
 </style>
 """, unsafe_allow_html=True)
 
-# 탭 구성
-dash_tab, tab1, tab2, tab3, tab4 = st.tabs(
-    ["🏠 대시보드", "📝 콘텐츠 기획", "🛍️ 소품 구매", "⏰ 타임테이블", "📹 영상 업로드 현황"]
-)
+# 화면 구성: 선택한 화면의 render()만 실행 (st.tabs는 모든 탭을 매번 그림)
+SECTIONS = {
+    "🏠 대시보드": dashboard.render,
+    "📝 콘텐츠 기획": planning.render,
+    "🛍️ 소품 구매": props.render,
+    "⏰ 타임테이블": timetable.render,
+    "📹 영상 업로드 현황": uploads.render,
+    "👥 출연자": performers.render,
+}
 
-with dash_tab:
-    dashboard.render()
-with tab1:
-    planning.render()
-with tab2:
-    props.render()
-with tab3:
-    timetable.render()
-with tab4:
-    uploads.render()
\ No newline at end of file
+section = st.radio("화면", list(SECTIONS), horizontal=True, key="_section", label_visibility="collapsed")
+st.markdown("---")
+SECTIONS[section]()